@@ -5,6 +5,8 @@ from rest_framework.views import APIView
 from rest_framework.response import Response
 from rest_framework import status
 from rest_framework.permissions import IsAdminUser
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
 from django.db.models import Q, Count
 from datetime import datetime, timedelta
 import calendar
@@ -17,6 +19,10 @@ from appointments.serializers import (
 )
 from doctors.models import Doctor
 
+# Dashboard stats are shared by every polling admin for a few seconds
+DASHBOARD_STATS_CACHE_KEY = 'admin_dashboard_stats'
+DASHBOARD_STATS_CACHE_TIMEOUT = 5
+
 
 class DashboardStatsAPIView(APIView):
     """
@@ -27,6 +33,15 @@ class DashboardStatsAPIView(APIView):
 
     def get(self, request):
         """Get dashboard statistics"""
+        data = cache.get_or_set(
+            DASHBOARD_STATS_CACHE_KEY,
+            self.build_stats,
+            timeout=DASHBOARD_STATS_CACHE_TIMEOUT
+        )
+        return Response(data)
+
+    def build_stats(self):
+        """Build the dashboard statistics payload"""
         today = datetime.now().date()
 
         # Calculate statistics
@@ -50,7 +65,7 @@ class DashboardStatsAPIView(APIView):
             count=Count('id')
         ).order_by('-count')
 
-        return Response({
+        return {
             'success': True,
             'statistics': {
                 'total_appointments': total_appointments,
@@ -61,7 +76,7 @@ class DashboardStatsAPIView(APIView):
             'upcoming_appointments': AppointmentSerializer(upcoming, many=True).data,
             'recent_appointments': AppointmentSerializer(recent, many=True).data,
             'status_breakdown': list(status_breakdown)
-        })
+        }
 
 
 class AppointmentListAPIView(APIView):
@@ -180,7 +195,18 @@ class AppointmentUpdateStatusAPIView(APIView):
             )
 
             if serializer.is_valid():
-                serializer.save()
+                try:
+                    with transaction.atomic():
+                        serializer.save()
+                except IntegrityError:
+                    # unique_active_appointment_slot: the slot was re-booked after this one was cancelled
+                    return Response({
+                        'success': False,
+                        'error': 'Slot already booked',
+                        'message': 'Another active appointment already holds this doctor, date and time'
+                    }, status=status.HTTP_400_BAD_REQUEST)
+
+                cache.delete(DASHBOARD_STATS_CACHE_KEY)
 
                 return Response({
                     'success': True,
@@ -1,3 +1,53 @@
+from datetime import time, timedelta
+
+from django.contrib.auth.models import User
 from django.test import TestCase
+from django.urls import reverse
+from django.utils import timezone
+from rest_framework.test import APIClient
+
+from appointments.models import Appointment, AppointmentHistory
+from doctors.models import Doctor, Specialization
 
 # Create your tests here.
+
+
+class AppointmentUpdateStatusAPITests(TestCase):
+    def setUp(self):
+        specialization = Specialization.objects.create(name='General Physician', keywords='fever')
+        doctor = Doctor.objects.create(
+            name='Asha Rao', specialization=specialization, phone='9000000000', email='asha@example.com'
+        )
+        slot = {
+            'doctor': doctor,
+            'appointment_date': timezone.localdate() + timedelta(days=1),
+            'appointment_time': time(9, 0),
+            'symptoms': 'fever',
+        }
+        self.cancelled = Appointment.objects.create(
+            patient_name='Ravi', patient_phone='9876543210', status='cancelled', **slot
+        )
+        Appointment.objects.create(patient_name='Meena', patient_phone='9123456780', status='confirmed', **slot)
+
+        self.client = APIClient(SERVER_NAME='localhost')
+        self.client.force_authenticate(User.objects.create_user('staff', password='x', is_staff=True))
+
+    def _update(self, appointment, new_status):
+        url = reverse('admin_panel:update_status', args=[appointment.booking_id])
+        return self.client.patch(url, {'status': new_status}, format='json')
+
+    def test_reactivating_into_a_booked_slot_returns_400(self):
+        response = self._update(self.cancelled, 'confirmed')
+
+        self.assertEqual(response.status_code, 400)
+        self.assertEqual(response.json()['error'], 'Slot already booked')
+        self.cancelled.refresh_from_db()
+        self.assertEqual(self.cancelled.status, 'cancelled')
+        self.assertFalse(AppointmentHistory.objects.filter(appointment=self.cancelled).exists())
+
+    def test_status_change_that_keeps_the_slot_free_succeeds(self):
+        response = self._update(self.cancelled, 'no_show')
+
+        self.assertEqual(response.status_code, 200)
+        self.cancelled.refresh_from_db()
+        self.assertEqual(self.cancelled.status, 'no_show')
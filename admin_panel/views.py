@@ -1,6 +1,7 @@
 from django.shortcuts import render, get_object_or_404, redirect
 from django.contrib.admin.views.decorators import staff_member_required
 from django.contrib import messages
+from django.db import IntegrityError, transaction
 from django.db.models import Q, Count
 from django.http import JsonResponse
 from datetime import datetime, timedelta
@@ -108,18 +109,23 @@ def update_appointment_status(request, booking_id):
         
         if new_status in dict(Appointment.STATUS_CHOICES).keys():
             appointment.status = new_status
-            appointment.save()
-            
-            # Create history entry
-            from appointments.models import AppointmentHistory
-            AppointmentHistory.objects.create(
-                appointment=appointment,
-                status=new_status,
-                notes=request.POST.get('notes', ''),
-                changed_by='admin'
-            )
-            
-            messages.success(request, f'Appointment status updated to {new_status}')
+            try:
+                with transaction.atomic():
+                    appointment.save()
+                    
+                    # Create history entry
+                    from appointments.models import AppointmentHistory
+                    AppointmentHistory.objects.create(
+                        appointment=appointment,
+                        status=new_status,
+                        notes=request.POST.get('notes', ''),
+                        changed_by='admin'
+                    )
+            except IntegrityError:
+                # unique_active_appointment_slot: the slot was re-booked after this one was cancelled
+                messages.error(request, 'Slot already booked by another active appointment')
+            else:
+                messages.success(request, f'Appointment status updated to {new_status}')
         else:
             messages.error(request, 'Invalid status')
     
@@ -0,0 +1,55 @@
+# Generated by Django 4.2.7 on 2026-10-17 15:17
+
+from django.db import migrations, models
+from django.db.models import Count
+
+ACTIVE_STATUSES = ['pending', 'confirmed']
+
+
+def check_no_duplicate_active_bookings(apps, schema_editor):
+    """Refuse to add the constraint while a doctor slot holds more than one active booking."""
+    Appointment = apps.get_model('appointments', 'Appointment')
+
+    duplicate_slots = list(
+        Appointment.objects.filter(status__in=ACTIVE_STATUSES)
+        .order_by()
+        .values('doctor_id', 'appointment_date', 'appointment_time')
+        .annotate(total=Count('id'))
+        .filter(total__gt=1)
+    )
+    if not duplicate_slots:
+        return
+
+    lines = []
+    for slot in duplicate_slots:
+        booking_ids = Appointment.objects.filter(
+            status__in=ACTIVE_STATUSES,
+            doctor_id=slot['doctor_id'],
+            appointment_date=slot['appointment_date'],
+            appointment_time=slot['appointment_time']
+        ).order_by('created_at', 'id').values_list('booking_id', flat=True)
+        lines.append(
+            f"  doctor {slot['doctor_id']} on {slot['appointment_date']} at {slot['appointment_time']}: "
+            f"{', '.join(booking_ids)}"
+        )
+
+    raise RuntimeError(
+        "Cannot add unique_active_appointment_slot: these doctor slots have more than one "
+        "pending/confirmed booking. Cancel or reschedule all but one booking per slot, "
+        "then run migrate again.\n" + "\n".join(lines)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('appointments', '0003_appointment_slot_status_index'),
+    ]
+
+    operations = [
+        migrations.RunPython(check_no_duplicate_active_bookings, migrations.RunPython.noop),
+        migrations.AddConstraint(
+            model_name='appointment',
+            constraint=models.UniqueConstraint(condition=models.Q(('status__in', ['pending', 'confirmed'])), fields=('doctor', 'appointment_date', 'appointment_time'), name='unique_active_appointment_slot'),
+        ),
+    ]
@@ -52,10 +52,19 @@ class Appointment(models.Model):
     class Meta:
         ordering = ['-appointment_date', '-appointment_time']
         indexes = [
-            models.Index(fields=['doctor', 'appointment_date', 'appointment_time']),
+            models.Index(fields=['doctor', 'appointment_date', 'appointment_time', 'status']),
+            models.Index(fields=['doctor', 'appointment_date', 'status']),
             models.Index(fields=['status']),
             models.Index(fields=['patient_phone']),
         ]
+        constraints = [
+            # One active booking per doctor slot
+            models.UniqueConstraint(
+                fields=['doctor', 'appointment_date', 'appointment_time'],
+                condition=models.Q(status__in=['pending', 'confirmed']),
+                name='unique_active_appointment_slot'
+            ),
+        ]
     
     def __str__(self):
         return f"{self.patient_name} - {self.doctor.name} on {self.appointment_date} at {self.appointment_time}"
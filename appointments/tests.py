@@ -1,3 +1,48 @@
+from datetime import time, timedelta
+
+from django.db import IntegrityError, transaction
 from django.test import TestCase
+from django.utils import timezone
+
+from appointments.models import Appointment
+from doctors.models import Doctor, Specialization
 
 # Create your tests here.
+
+
+class ActiveSlotConstraintTests(TestCase):
+    def setUp(self):
+        specialization = Specialization.objects.create(name='General Physician', keywords='fever')
+        self.doctor = Doctor.objects.create(
+            name='Asha Rao', specialization=specialization, phone='9000000000', email='asha@example.com'
+        )
+        self.day = timezone.localdate() + timedelta(days=1)
+
+    def _book(self, status='confirmed', slot=time(9, 0)):
+        return Appointment.objects.create(
+            doctor=self.doctor, patient_name='Ravi', patient_phone='9876543210',
+            appointment_date=self.day, appointment_time=slot, symptoms='fever', status=status
+        )
+
+    def test_second_active_booking_for_slot_is_rejected(self):
+        self._book()
+
+        for status in ['pending', 'confirmed']:
+            with self.subTest(status=status), self.assertRaises(IntegrityError), transaction.atomic():
+                self._book(status=status)
+
+    def test_inactive_bookings_do_not_hold_the_slot(self):
+        self._book(status='cancelled')
+        self._book(status='completed')
+
+        self._book()
+
+        self.assertEqual(Appointment.objects.filter(doctor=self.doctor, appointment_date=self.day).count(), 3)
+
+    def test_reactivating_a_rebooked_slot_is_rejected(self):
+        cancelled = self._book(status='cancelled')
+        self._book()
+
+        cancelled.status = 'confirmed'
+        with self.assertRaises(IntegrityError), transaction.atomic():
+            cancelled.save()
@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 from django.core.cache import cache
+from django.db import IntegrityError, transaction
 from doctors.models import Doctor, DoctorSchedule
 from appointments.models import Appointment
 from patient_booking.models import PatientRecord
@@ -713,12 +714,7 @@ class ConversationManager:
 
             if existing_appointment:
                 # Slot is already booked
-                available_slots = self._get_available_slots(doctor_id, appointment_date)
-                return {
-                    'message': f"⚠️ Sorry, the time slot {selected_time} is already booked.\n\nPlease choose from the available time slots:",
-                    'action': 'select_time',
-                    'options': available_slots
-                }
+                return self._slot_taken_response(doctor_id, appointment_date, selected_time)
 
             # Time is valid and available
             self.state['data']['appointment_time'] = parsed_time.strftime('%H:%M')
@@ -738,22 +734,27 @@ class ConversationManager:
                     # Update appointment with new date and time
                     appointment.appointment_date = appointment_date
                     appointment.appointment_time = parsed_time
-                    appointment.save()
 
                     # Create appointment history record with old and new values
                     from appointments.models import AppointmentHistory
-                    AppointmentHistory.objects.create(
-                        appointment=appointment,
-                        status=appointment.status,
-                        notes=f'Appointment rescheduled from {old_formatted_date} {old_formatted_time} to {appointment_date.strftime("%A, %B %d, %Y")} {parsed_time.strftime("%I:%M %p")}',
-                        changed_by='patient',
-                        action='reschedule',
-                        old_date=old_date,
-                        old_time=old_time,
-                        new_date=appointment_date,
-                        new_time=parsed_time,
-                        reason='Patient requested reschedule via WhatsApp'
-                    )
+                    try:
+                        with transaction.atomic():
+                            appointment.save()
+                            AppointmentHistory.objects.create(
+                                appointment=appointment,
+                                status=appointment.status,
+                                notes=f'Appointment rescheduled from {old_formatted_date} {old_formatted_time} to {appointment_date.strftime("%A, %B %d, %Y")} {parsed_time.strftime("%I:%M %p")}',
+                                changed_by='patient',
+                                action='reschedule',
+                                old_date=old_date,
+                                old_time=old_time,
+                                new_date=appointment_date,
+                                new_time=parsed_time,
+                                reason='Patient requested reschedule via WhatsApp'
+                            )
+                    except IntegrityError:
+                        # Another booking took the slot after the availability check
+                        return self._slot_taken_response(doctor_id, appointment_date, selected_time)
 
                     self.state['stage'] = 'confirmation'
 
@@ -937,7 +938,16 @@ class ConversationManager:
                 }
 
             # Create appointment
-            appointment = self._create_appointment()
+            try:
+                appointment = self._create_appointment()
+            except IntegrityError:
+                # Another booking took the slot while the patient was reviewing
+                self.state['stage'] = 'time_selection'
+                return self._slot_taken_response(
+                    self.state['data']['doctor_id'],
+                    datetime.strptime(self.state['data']['appointment_date'], '%Y-%m-%d').date(),
+                    self.state['data']['appointment_time']
+                )
 
             if appointment:
                 self.state['stage'] = 'confirmation'
@@ -1497,6 +1507,14 @@ class ConversationManager:
         
         return dates
     
+    def _slot_taken_response(self, doctor_id, date, selected_time):
+        """Ask the patient to pick another time when the chosen slot is booked"""
+        return {
+            'message': f"⚠️ Sorry, the time slot {selected_time} is already booked.\n\nPlease choose from the available time slots:",
+            'action': 'select_time',
+            'options': self._get_available_slots(doctor_id, date)
+        }
+
     def _get_available_slots(self, doctor_id, date, show_all=True):
         """Get available time slots for a doctor on a specific date
 
@@ -1799,18 +1817,19 @@ Is there anything else I can help you with?"""
             # Get doctor info
             doctor = Doctor.objects.get(id=data['doctor_id'])
 
-            # Create appointment
-            appointment = Appointment.objects.create(
-                doctor_id=data['doctor_id'],
-                patient_name=data['patient_name'],
-                patient_phone=data['patient_phone'],
-                patient_email=data.get('patient_email', ''),
-                appointment_date=data['appointment_date'],
-                appointment_time=data['appointment_time'],
-                symptoms=data.get('symptoms', 'Not specified'),
-                status='confirmed',
-                session_id=self.session_id
-            )
+            # Create appointment, the unique slot constraint rejects a booking that raced us
+            with transaction.atomic():
+                appointment = Appointment.objects.create(
+                    doctor_id=data['doctor_id'],
+                    patient_name=data['patient_name'],
+                    patient_phone=data['patient_phone'],
+                    patient_email=data.get('patient_email', ''),
+                    appointment_date=data['appointment_date'],
+                    appointment_time=data['appointment_time'],
+                    symptoms=data.get('symptoms', 'Not specified'),
+                    status='confirmed',
+                    session_id=self.session_id
+                )
 
             print(f"Appointment created successfully: {appointment.booking_id}")
 
@@ -1843,6 +1862,8 @@ Is there anything else I can help you with?"""
 
             return appointment
 
+        except IntegrityError:
+            raise
         except Exception as e:
             print(f"ERROR creating appointment: {str(e)}")
             import traceback
@@ -6,12 +6,39 @@ Handles Speech-to-Text (STT) and Text-to-Speech (TTS) functionality
 import os
 import io
 import base64
+import hashlib
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from typing import Dict, Any, Optional, Tuple
 from django.conf import settings
+from django.core.cache import cache
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Synthesized audio is cached for a day; canned prompts repeat constantly
+TTS_CACHE_TIMEOUT = 60 * 60 * 24
+
+# Transcripts are cached for an hour so retried uploads skip the STT call
+STT_CACHE_TIMEOUT = 60 * 60
+
+# Background workers used to warm the TTS cache ahead of playback
+TTS_PREFETCH_WORKERS = 2
+_tts_prefetch_executor = ThreadPoolExecutor(max_workers=TTS_PREFETCH_WORKERS, thread_name_prefix='tts-prefetch')
+# One slot per worker; a prefetch is dropped instead of queued when all are taken
+_tts_prefetch_slots = threading.BoundedSemaphore(TTS_PREFETCH_WORKERS)
+
+# Stage whose guidance is spoken next in the booking flow
+NEXT_GUIDANCE_STAGE = {
+    'greeting': 'symptoms',
+    'symptoms': 'doctor_selection',
+    'doctor_selection': 'date_selection',
+    'date_selection': 'time_selection',
+    'time_selection': 'patient_details',
+    'patient_details': 'confirmation',
+    'confirmation': 'completed',
+}
+
 
 class VoiceService:
     """
@@ -46,7 +73,16 @@ class VoiceService:
         """
         try:
             if self.use_google_cloud:
-                return self._transcribe_google_cloud(audio_data, audio_format)
+                cache_key = self._stt_cache_key(audio_data, audio_format)
+                result = cache.get(cache_key)
+                if result is not None:
+                    logger.debug(f"STT cache hit: {cache_key}")
+                    return result
+
+                result = self._transcribe_google_cloud(audio_data, audio_format)
+                if result.get('success'):
+                    cache.set(cache_key, result, timeout=STT_CACHE_TIMEOUT)
+                return result
             else:
                 # Web Speech API is handled on frontend, this is a fallback
                 return {
@@ -62,6 +98,14 @@ class VoiceService:
                 'text': ''
             }
 
+    @staticmethod
+    def _stt_cache_key(audio_data: bytes, audio_format: str) -> str:
+        """
+        Build the cache key for the transcript of an audio clip.
+        """
+        digest = hashlib.sha256(audio_data).hexdigest()
+        return f"stt_google_{audio_format.lower()}_{digest}"
+
     def _transcribe_google_cloud(self, audio_data: bytes, audio_format: str) -> Dict[str, Any]:
         """
         Transcribe audio using Google Cloud Speech-to-Text API.
@@ -124,7 +168,16 @@ class VoiceService:
         """
         try:
             if self.use_google_cloud:
-                return self._synthesize_google_cloud(text, language_code)
+                cache_key = self._tts_cache_key(text, language_code)
+                result = cache.get(cache_key)
+                if result is not None:
+                    logger.debug(f"TTS cache hit: {cache_key}")
+                    return result
+
+                result = self._synthesize_google_cloud(text, language_code)
+                if result.get('success'):
+                    cache.set(cache_key, result, timeout=TTS_CACHE_TIMEOUT)
+                return result
             else:
                 # Web Speech API synthesis is handled on frontend
                 return {
@@ -141,6 +194,40 @@ class VoiceService:
                 'audio_data': ''
             }
 
+    def prefetch_speech(self, text: str, language_code: str = 'en-IN') -> None:
+        """
+        Warm the TTS cache for text that is about to be spoken.
+        Synthesis runs in the background; this returns immediately.
+
+        Args:
+            text: Text that will likely be synthesized next
+            language_code: Language code (en-IN, hi-IN, etc.)
+        """
+        if not self.use_google_cloud or not text:
+            return
+
+        if cache.get(self._tts_cache_key(text, language_code)) is not None:
+            return
+
+        if not _tts_prefetch_slots.acquire(blocking=False):
+            logger.debug("TTS prefetch skipped, workers busy")
+            return
+
+        try:
+            future = _tts_prefetch_executor.submit(self.synthesize_speech, text, language_code)
+        except RuntimeError:
+            _tts_prefetch_slots.release()
+            raise
+        future.add_done_callback(lambda _: _tts_prefetch_slots.release())
+
+    @staticmethod
+    def _tts_cache_key(text: str, language_code: str) -> str:
+        """
+        Build the cache key for synthesized audio of a text/language pair.
+        """
+        digest = hashlib.sha1(text.encode('utf-8')).hexdigest()
+        return f"tts_google_{language_code}_{digest}"
+
     def _synthesize_google_cloud(self, text: str, language_code: str) -> Dict[str, Any]:
         """
         Synthesize speech using Google Cloud Text-to-Speech API.
@@ -0,0 +1,51 @@
+"""
+Record the doctors migrations on databases built with ``migrate --run-syncdb``.
+
+Such databases already have the doctors tables, but ``django_migrations`` has
+no doctors rows while ``appointments.0001`` (which depends on doctors) is
+recorded, so ``migrate`` refuses to run with an inconsistent history.
+"""
+from django.apps import apps
+from django.core.management.base import BaseCommand
+from django.db import connection
+from django.db.migrations.loader import MigrationLoader
+from django.db.migrations.operations import AddIndex
+from django.db.migrations.recorder import MigrationRecorder
+
+
+class Command(BaseCommand):
+    help = 'Mark doctors migrations whose tables and indexes already exist as applied'
+
+    def handle(self, *args, **options):
+        recorder = MigrationRecorder(connection)
+        if any(app_label == 'doctors' for app_label, _ in recorder.applied_migrations()):
+            self.stdout.write('doctors migrations are already recorded, run migrate instead')
+            return
+
+        doctor_table = apps.get_model('doctors', 'Doctor')._meta.db_table
+        if doctor_table not in connection.introspection.table_names():
+            self.stdout.write('doctors tables do not exist, run migrate instead')
+            return
+
+        loader = MigrationLoader(connection)
+        for app_label, name in loader.graph.forwards_plan(loader.graph.leaf_nodes('doctors')[0]):
+            if app_label != 'doctors':
+                continue
+            migration = loader.get_migration(app_label, name)
+            if not migration.initial and not self._indexes_exist(migration):
+                break
+            recorder.record_applied(app_label, name)
+            self.stdout.write(f'Recorded {app_label}.{name}')
+
+        self.stdout.write(self.style.SUCCESS('Done, now run: python manage.py migrate'))
+
+    def _indexes_exist(self, migration):
+        """True when every operation is an AddIndex whose index is already in the database"""
+        with connection.cursor() as cursor:
+            for operation in migration.operations:
+                if not isinstance(operation, AddIndex):
+                    return False
+                table = apps.get_model('doctors', operation.model_name)._meta.db_table
+                if operation.index.name not in connection.introspection.get_constraints(cursor, table):
+                    return False
+        return True
@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 15:47
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doctors', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='doctorleave',
+            index=models.Index(fields=['doctor', 'start_date', 'end_date'], name='doctors_doc_doctor__15dbad_idx'),
+        ),
+    ]
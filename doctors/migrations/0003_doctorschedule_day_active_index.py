@@ -0,0 +1,17 @@
+# Generated by Django 4.2.7 on 2026-10-17 15:58
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('doctors', '0002_doctorleave_date_range_index'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='doctorschedule',
+            index=models.Index(fields=['doctor', 'day_of_week', 'is_active'], name='doctors_doc_doctor__0d3163_idx'),
+        ),
+    ]
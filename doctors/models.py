@@ -85,6 +85,9 @@ class DoctorSchedule(models.Model):
     class Meta:
         ordering = ['doctor', 'day_of_week', 'start_time']
         unique_together = ['doctor', 'day_of_week', 'start_time']
+        indexes = [
+            models.Index(fields=['doctor', 'day_of_week', 'is_active']),
+        ]
     
     def __str__(self):
         return f"{self.doctor.name} - {self.get_day_of_week_display()} ({self.start_time} - {self.end_time})"
@@ -106,6 +109,9 @@ class DoctorLeave(models.Model):
     
     class Meta:
         ordering = ['-start_date']
+        indexes = [
+            models.Index(fields=['doctor', 'start_date', 'end_date']),
+        ]
     
     def __str__(self):
         return f"{self.doctor.name} - Leave from {self.start_date} to {self.end_date}"
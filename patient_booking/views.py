@@ -13,7 +13,6 @@ import base64
 import logging
 import traceback
 from chatbot.conversation_manager import ConversationManager
-from chatbot.voice_service import voice_service
 from chatbot.voice_assistant_manager import VoiceAssistantManager
 
 # Setup logger
@@ -137,6 +136,10 @@ class VoiceAPIView(View):
 
     def post(self, request):
         """Handle voice transcription and synthesis requests"""
+        # Imported here so the speech clients are only created once a voice
+        # request arrives, not when the URLconf loads this module
+        from chatbot.voice_service import NEXT_GUIDANCE_STAGE, voice_service
+
         try:
             # Handle empty or invalid request body
             if not request.body or request.body.strip() == b'':
@@ -198,6 +201,13 @@ class VoiceAPIView(View):
                 stage = data.get('stage', 'greeting')
                 guidance = voice_service.get_voice_guidance(stage)
 
+                # Guidance is fixed per stage, so synthesize it and the next stage's now
+                language_code = data.get('language', 'en-IN')
+                voice_service.prefetch_speech(guidance, language_code)
+                next_stage = NEXT_GUIDANCE_STAGE.get(stage)
+                if next_stage:
+                    voice_service.prefetch_speech(voice_service.get_voice_guidance(next_stage), language_code)
+
                 return JsonResponse({
                     'success': True,
                     'guidance': guidance
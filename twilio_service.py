@@ -6,6 +6,7 @@ from django.conf import settings
 from twilio.rest import Client
 from twilio.base.exceptions import TwilioRestException
 import logging
+import threading
 
 logger = logging.getLogger(__name__)
 
@@ -292,6 +293,7 @@ Thank you!"""
 
 # Singleton instance
 _twilio_service = None
+_twilio_service_lock = threading.Lock()
 
 
 def get_twilio_service():
@@ -303,5 +305,8 @@ def get_twilio_service():
     """
     global _twilio_service
     if _twilio_service is None:
-        _twilio_service = TwilioSMSService()
+        with _twilio_service_lock:
+            # Re-check: another thread may have created it while we waited
+            if _twilio_service is None:
+                _twilio_service = TwilioSMSService()
     return _twilio_service
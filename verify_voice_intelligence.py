@@ -3,6 +3,7 @@ Simple Verification Script for Voice Intelligence Assistant
 Run this to verify the implementation is correct.
 """
 
+import argparse
 import sys
 import os
 
@@ -82,8 +83,10 @@ def check_class_structure():
         from voicebot.database_action_handler import DatabaseActionHandler
         from voicebot.voice_intelligence_manager import VoiceIntelligenceManager
 
+        # Inspect the classes directly; instantiating them would set up
+        # AI clients just to look up method names.
+
         # Check VoiceIntelligenceService
-        service = VoiceIntelligenceService()
         required_methods = [
             'understand_voice_input',
             'identify_intent',
@@ -93,13 +96,12 @@ def check_class_structure():
 
         print("VoiceIntelligenceService methods:")
         for method in required_methods:
-            if hasattr(service, method):
+            if hasattr(VoiceIntelligenceService, method):
                 print(f"  ✓ {method}")
             else:
                 print(f"  ✗ {method} - MISSING!")
 
         # Check DatabaseActionHandler
-        handler = DatabaseActionHandler()
         required_methods = [
             'execute_action',
             'create_appointment',
@@ -110,13 +112,12 @@ def check_class_structure():
 
         print("\nDatabaseActionHandler methods:")
         for method in required_methods:
-            if hasattr(handler, method):
+            if hasattr(DatabaseActionHandler, method):
                 print(f"  ✓ {method}")
             else:
                 print(f"  ✗ {method} - MISSING!")
 
         # Check VoiceIntelligenceManager
-        manager = VoiceIntelligenceManager()
         required_methods = [
             'process_voice_input',
             'execute_database_action_directly',
@@ -125,7 +126,7 @@ def check_class_structure():
 
         print("\nVoiceIntelligenceManager methods:")
         for method in required_methods:
-            if hasattr(manager, method):
+            if hasattr(VoiceIntelligenceManager, method):
                 print(f"  ✓ {method}")
             else:
                 print(f"  ✗ {method} - MISSING!")
@@ -240,13 +241,18 @@ def print_summary(results):
         ("URL Configuration Check", results[4]),
     ]
 
-    passed = sum(1 for _, result in checks if result)
-    total = len(checks)
-
     for check_name, result in checks:
-        status = "✅ PASSED" if result else "❌ FAILED"
+        if result is None:
+            status = "⏭️  SKIPPED"
+        else:
+            status = "✅ PASSED" if result else "❌ FAILED"
         print(f"{check_name}: {status}")
 
+    # Skipped checks (None) don't count towards the total
+    checks = [(name, result) for name, result in checks if result is not None]
+    passed = sum(1 for _, result in checks if result)
+    total = len(checks)
+
     print()
     print(f"Total: {passed}/{total} checks passed")
     print()
@@ -266,6 +272,14 @@ def print_summary(results):
 
 def main():
     """Run all verification checks."""
+    parser = argparse.ArgumentParser(description="Verify the Voice Intelligence Assistant setup")
+    parser.add_argument(
+        '--fast',
+        action='store_true',
+        help="Skip the voice understanding test (no AI service calls)",
+    )
+    args = parser.parse_args()
+
     print("\n")
     print("╔════════════════════════════════════════════════════════════╗")
     print("║   Voice Intelligence Assistant - Verification Script       ║")
@@ -278,14 +292,14 @@ def main():
     results.append(check_files())
     results.append(check_imports())
     results.append(check_class_structure())
-    results.append(test_voice_understanding())
+    results.append(None if args.fast else test_voice_understanding())
     results.append(check_urls())
 
     # Print summary
     print_summary(results)
 
     # Return exit code
-    return 0 if all(results) else 1
+    return 0 if all(result is not False for result in results) else 1
 
 
 if __name__ == "__main__":
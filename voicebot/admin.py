@@ -1,4 +1,5 @@
 from django.contrib import admin
+from django.db.models.functions import Substr
 from voicebot.models import VoiceConversation, ConversationMessage
 
 
@@ -13,6 +14,8 @@ class VoiceConversationAdmin(admin.ModelAdmin):
     search_fields = ['session_id', 'patient_name', 'patient_phone', 'doctor_name']
     readonly_fields = ['session_id', 'created_at', 'updated_at']
     ordering = ['-updated_at']
+    list_per_page = 50
+    show_full_result_count = False
 
     fieldsets = (
         ('Session Information', {
@@ -37,11 +40,22 @@ class ConversationMessageAdmin(admin.ModelAdmin):
     list_filter = ['role', 'intent', 'timestamp']
     search_fields = ['conversation__session_id', 'content']
     readonly_fields = ['timestamp']
+    raw_id_fields = ['conversation']
     ordering = ['-timestamp']
+    list_select_related = ['conversation']
+    list_per_page = 50
+    show_full_result_count = False
+
+    def get_queryset(self, request):
+        """Fetch only a content prefix for the preview column"""
+        return super().get_queryset(request).annotate(
+            _preview=Substr('content', 1, 101)
+        ).defer('content')
 
     def content_preview(self, obj):
         """Show preview of message content"""
-        return obj.content[:100] + '...' if len(obj.content) > 100 else obj.content
+        preview = obj._preview
+        return preview[:100] + '...' if len(preview) > 100 else preview
 
     content_preview.short_description = 'Message Preview'
 
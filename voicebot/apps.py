@@ -5,3 +5,6 @@ class VoicebotConfig(AppConfig):
     default_auto_field = 'django.db.models.BigAutoField'
     name = 'voicebot'
     verbose_name = 'Voice Assistant Bot'
+
+    def ready(self):
+        from . import signals
@@ -4,6 +4,7 @@ Maintains full conversation memory and booking state
 """
 
 from voicebot.models import VoiceConversation, ConversationMessage
+from django.db.models import F
 from django.utils import timezone
 
 
@@ -12,9 +13,30 @@ class ConversationContextManager:
     Manages conversation context, history, and state for RAG-based booking
     """
 
+    # Booking state key -> key used in legacy session data
+    SESSION_DATA_KEYS = {
+        'patient_name': 'patient_name',
+        'patient_phone': 'phone',
+        'appointment_date': 'appointment_date',
+        'appointment_time': 'appointment_time',
+        'doctor_id': 'doctor_id',
+        'doctor_name': 'doctor_name',
+    }
+
+    # Short field name -> conversation fields cleared by clear_field()
+    CLEAR_FIELD_MAPPING = {
+        'doctor': ['doctor_id', 'doctor_name'],
+        'date': ['appointment_date'],
+        'time': ['appointment_time'],
+        'phone': ['patient_phone'],
+        'name': ['patient_name'],
+    }
+
     def __init__(self, session_id):
         self.session_id = session_id
         self.conversation = None
+        # Messages added this request, written in one batch by flush_messages()
+        self._pending_messages = []
         self._load_or_create_conversation()
 
     def _load_or_create_conversation(self):
@@ -37,7 +59,8 @@ class ConversationContextManager:
 
     def add_message(self, role, content, intent=None, extracted_data=None):
         """
-        Add message to conversation history
+        Add message to conversation history.
+        The message is buffered and saved on the next flush_messages() call.
 
         Args:
             role: 'user', 'assistant', or 'system'
@@ -45,35 +68,65 @@ class ConversationContextManager:
             intent: Detected intent (optional)
             extracted_data: Any data extracted from message (optional)
         """
-        ConversationMessage.objects.create(
+        self._pending_messages.append(ConversationMessage(
             conversation=self.conversation,
             role=role,
             content=content,
             intent=intent,
             extracted_data=extracted_data or {}
+        ))
+
+    def flush_messages(self):
+        """Save all buffered messages with a single bulk INSERT"""
+        if not self._pending_messages:
+            return
+
+        count = len(self._pending_messages)
+        ConversationMessage.objects.bulk_create(self._pending_messages)
+        VoiceConversation.objects.filter(pk=self.conversation.pk).update(
+            message_count=F('message_count') + count
         )
+        self.conversation.message_count += count
+        self._pending_messages = []
 
     def get_conversation_history(self, limit=20):
         """
         Get conversation history as list of dicts
 
         Args:
-            limit: Maximum number of messages to retrieve
+            limit: Maximum number of most recent messages to retrieve
 
         Returns:
-            List of message dicts
+            List of message dicts, oldest first
         """
-        messages = self.conversation.messages.order_by('timestamp')[:limit]
+        # Buffered messages are newer than anything already saved
+        pending = self._pending_messages[-limit:] if limit > 0 else []
+        saved_limit = limit - len(pending)
+
+        # Newest saved messages first so LIMIT applies in SQL, then restore order
+        messages = []
+        if saved_limit > 0:
+            messages = list(
+                self.conversation.messages.order_by('-timestamp').values(
+                    'role', 'content', 'intent', 'timestamp'
+                )[:saved_limit]
+            )
+            messages.reverse()
 
-        return [
+        messages.extend(
             {
                 'role': msg.role,
                 'content': msg.content,
                 'intent': msg.intent,
-                'timestamp': msg.timestamp.isoformat()
+                'timestamp': msg.timestamp
             }
-            for msg in messages
-        ]
+            for msg in pending
+        )
+
+        for msg in messages:
+            msg['timestamp'] = msg['timestamp'].isoformat()
+
+        return messages
 
     def update_booking_state(self, **kwargs):
         """
@@ -82,12 +135,27 @@ class ConversationContextManager:
         Args:
             **kwargs: Any booking fields (patient_name, doctor_id, etc.)
         """
-        for field, value in kwargs.items():
-            if hasattr(self.conversation, field) and value is not None:
-                setattr(self.conversation, field, value)
+        updates = {
+            field: value for field, value in kwargs.items()
+            if hasattr(self.conversation, field) and value is not None
+        }
+
+        self._save_fields(**updates)
+
+    def _save_fields(self, **fields):
+        """
+        Write only the given columns (plus updated_at) with a single UPDATE,
+        keeping the in-memory conversation in sync
 
-        self.conversation.updated_at = timezone.now()
-        self.conversation.save()
+        Args:
+            **fields: Conversation fields and their new values
+        """
+        fields['updated_at'] = timezone.now()
+
+        for field, value in fields.items():
+            setattr(self.conversation, field, value)
+
+        VoiceConversation.objects.filter(pk=self.conversation.pk).update(**fields)
 
     def get_booking_state(self):
         """
@@ -110,8 +178,7 @@ class ConversationContextManager:
 
     def set_stage(self, stage):
         """Update conversation stage"""
-        self.conversation.stage = stage
-        self.conversation.save()
+        self._save_fields(stage=stage)
 
     def get_stage(self):
         """Get current conversation stage"""
@@ -119,10 +186,10 @@ class ConversationContextManager:
 
     def mark_completed(self, appointment_id=None):
         """Mark conversation as completed"""
-        self.conversation.completed = True
+        updates = {'completed': True}
         if appointment_id:
-            self.conversation.appointment_id = appointment_id
-        self.conversation.save()
+            updates['appointment_id'] = appointment_id
+        self._save_fields(**updates)
 
     def get_session_data(self):
         """
@@ -133,30 +200,16 @@ class ConversationContextManager:
         """
         booking_state = self.get_booking_state()
 
-        # Convert to format expected by existing code
-        session_data = {
+        # Convert to format expected by existing code, keeping non-null fields
+        return {
             'stage': booking_state['stage'],
-            'data': {}
+            'data': {
+                self.SESSION_DATA_KEYS[key]: value
+                for key, value in booking_state.items()
+                if value is not None and key in self.SESSION_DATA_KEYS
+            }
         }
 
-        # Add all non-null booking fields to data
-        for key, value in booking_state.items():
-            if value is not None and key != 'stage':
-                if key == 'patient_name':
-                    session_data['data']['patient_name'] = value
-                elif key == 'patient_phone':
-                    session_data['data']['phone'] = value
-                elif key == 'appointment_date':
-                    session_data['data']['appointment_date'] = value
-                elif key == 'appointment_time':
-                    session_data['data']['appointment_time'] = value
-                elif key == 'doctor_id':
-                    session_data['data']['doctor_id'] = value
-                elif key == 'doctor_name':
-                    session_data['data']['doctor_name'] = value
-
-        return session_data
-
     def clear_field(self, field_name):
         """
         Clear a specific booking field (for changes/corrections)
@@ -164,21 +217,12 @@ class ConversationContextManager:
         Args:
             field_name: Name of field to clear
         """
-        field_mapping = {
-            'doctor': ['doctor_id', 'doctor_name'],
-            'date': ['appointment_date'],
-            'time': ['appointment_time'],
-            'phone': ['patient_phone'],
-            'name': ['patient_name']
-        }
-
-        fields_to_clear = field_mapping.get(field_name, [field_name])
+        fields_to_clear = self.CLEAR_FIELD_MAPPING.get(field_name, [field_name])
 
-        for field in fields_to_clear:
-            if hasattr(self.conversation, field):
-                setattr(self.conversation, field, None)
-
-        self.conversation.save()
+        self._save_fields(**{
+            field: None for field in fields_to_clear
+            if hasattr(self.conversation, field)
+        })
 
     def get_summary(self):
         """
@@ -190,7 +234,7 @@ class ConversationContextManager:
         return {
             'session_id': self.session_id,
             'stage': self.conversation.stage,
-            'message_count': self.conversation.messages.count(),
+            'message_count': self.conversation.message_count + len(self._pending_messages),
             'completed': self.conversation.completed,
             'booking_state': self.get_booking_state(),
             'created_at': self.conversation.created_at.isoformat(),
@@ -199,17 +243,18 @@ class ConversationContextManager:
 
     def reset_conversation(self):
         """Reset conversation (for testing or restart)"""
-        # Clear all booking data
-        self.conversation.patient_name = None
-        self.conversation.patient_phone = None
-        self.conversation.doctor_id = None
-        self.conversation.doctor_name = None
-        self.conversation.appointment_date = None
-        self.conversation.appointment_time = None
-        self.conversation.appointment_id = None
-        self.conversation.stage = 'greeting'
-        self.conversation.completed = False
-        self.conversation.save()
+        # Clear all booking data in a single UPDATE
+        self._save_fields(
+            patient_name=None,
+            patient_phone=None,
+            doctor_id=None,
+            doctor_name=None,
+            appointment_date=None,
+            appointment_time=None,
+            appointment_id=None,
+            stage='greeting',
+            completed=False
+        )
 
         # Add reset message
         self.add_message(
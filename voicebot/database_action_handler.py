@@ -3,15 +3,46 @@ Database Action Handler
 Processes structured JSON actions and executes corresponding database operations.
 """
 
-import json
-from typing import Dict, Any, List, Optional
-from datetime import datetime, timedelta, time as dt_time
-from difflib import SequenceMatcher
+from collections import Counter
+from typing import Dict, Any, List, Optional, Tuple
+from datetime import datetime, timedelta, date as dt_date, time as dt_time
+from django.core.cache import cache
+from django.db import IntegrityError, transaction
 from django.db.models import Q
 from django.utils import timezone
+from rapidfuzz import fuzz, process
 
 from doctors.models import Doctor, DoctorSchedule, Specialization
 from appointments.models import Appointment
+from voicebot.time_format import format_time
+
+# Doctor/specialization reference data is cached; voicebot.signals clears it on change
+SPECIALIZATIONS_CACHE_KEY = 'voicebot_specializations'
+ACTIVE_DOCTOR_NAMES_CACHE_KEY = 'voicebot_active_doctor_names'
+SCHEDULE_CACHE_KEY = 'voicebot_schedule_{doctor_id}_{weekday}'
+REFERENCE_DATA_CACHE_TIMEOUT = 300
+
+# Available slots per doctor/date, cleared when an appointment changes
+AVAILABLE_SLOTS_CACHE_KEY = 'voicebot_slots_{doctor_id}_{date}'
+AVAILABLE_SLOTS_CACHE_TIMEOUT = 60
+
+
+def _parse_date(value: str) -> dt_date:
+    """Parse a YYYY-MM-DD date."""
+    return dt_date.fromisoformat(value)
+
+
+def _parse_time(value: str) -> dt_time:
+    """Parse an 'HH:MM AM/PM' time as written by format_time()."""
+    clock, _, period = value.strip().partition(' ')
+    hour, _, minute = clock.partition(':')
+    period = period.strip().upper()
+    if not (hour.isdigit() and minute.isdigit() and len(minute) == 2 and period in ('AM', 'PM')):
+        raise ValueError(f"time {value!r} is not in 'HH:MM AM/PM' format")
+    hour, minute = int(hour), int(minute)
+    if not 1 <= hour <= 12 or minute > 59:
+        raise ValueError(f"time {value!r} is out of range")
+    return dt_time(hour % 12 + (12 if period == 'PM' else 0), minute)
 
 
 class DatabaseActionHandler:
@@ -20,6 +51,17 @@ class DatabaseActionHandler:
     Receives actions from Voice Intelligence Service and returns results.
     """
 
+    # query_type -> handler method name
+    HANDLERS = {
+        'create_appointment': 'create_appointment',
+        'appointment_lookup': 'lookup_appointment',
+        'cancel_appointment': 'cancel_appointment',
+        'reschedule_appointment': 'reschedule_appointment',
+        'get_doctors': 'get_doctors',
+        'check_availability': 'check_availability',
+        'get_doctor_by_symptoms': 'get_doctor_by_symptoms'
+    }
+
     def execute_action(self, action: Dict[str, Any]) -> Dict[str, Any]:
         """
         Execute database action and return results.
@@ -51,19 +93,9 @@ class DatabaseActionHandler:
             }
 
         # Route to appropriate handler
-        handlers = {
-            'create_appointment': self.create_appointment,
-            'appointment_lookup': self.lookup_appointment,
-            'cancel_appointment': self.cancel_appointment,
-            'reschedule_appointment': self.reschedule_appointment,
-            'get_doctors': self.get_doctors,
-            'check_availability': self.check_availability,
-            'get_doctor_by_symptoms': self.get_doctor_by_symptoms
-        }
-
-        handler = handlers.get(query_type)
+        handler_name = self.HANDLERS.get(query_type)
 
-        if not handler:
+        if not handler_name:
             return {
                 "status": "error",
                 "message": f"Unknown query type: {query_type}",
@@ -71,7 +103,7 @@ class DatabaseActionHandler:
             }
 
         try:
-            return handler(parameters)
+            return getattr(self, handler_name)(parameters)
         except Exception as e:
             return {
                 "status": "error",
@@ -105,11 +137,16 @@ class DatabaseActionHandler:
                 "data": {"missing_fields": missing}
             }
 
+        patient_name = params['patient_name']
+        phone = params['phone']
+        date_str = params['date']
+        time_str = params['time']
+
         # Get or find doctor
         doctor = None
         if params.get('doctor_id'):
             try:
-                doctor = Doctor.objects.get(id=params['doctor_id'], is_active=True)
+                doctor = self._doctor_queryset().get(id=params['doctor_id'], is_active=True)
             except Doctor.DoesNotExist:
                 return {
                     "status": "error",
@@ -133,8 +170,8 @@ class DatabaseActionHandler:
 
         # Parse date and time
         try:
-            appointment_date = datetime.strptime(params['date'], '%Y-%m-%d').date()
-            appointment_time = datetime.strptime(params['time'], '%I:%M %p').time()
+            appointment_date = _parse_date(date_str)
+            appointment_time = _parse_time(time_str)
         except ValueError as e:
             return {
                 "status": "error",
@@ -143,33 +180,36 @@ class DatabaseActionHandler:
             }
 
         # Validate date is in future
-        if appointment_date < timezone.now().date():
+        if appointment_date < timezone.localdate():
             return {
                 "status": "error",
                 "message": "Appointment date must be in the future",
                 "data": None
             }
 
-        # Check availability
-        is_available = self._check_slot_availability(doctor, appointment_date, appointment_time)
-        if not is_available:
-            return {
-                "status": "error",
-                "message": "Selected time slot is not available",
-                "data": {"reason": "slot_occupied"}
-            }
+        # Check the doctor works at that time
+        slot_unavailable = {
+            "status": "error",
+            "message": "Selected time slot is not available",
+            "data": {"reason": "slot_occupied"}
+        }
+        if not self._is_within_schedule(doctor, appointment_date, appointment_time):
+            return slot_unavailable
 
-        # Create appointment
-        appointment = Appointment.objects.create(
-            doctor=doctor,
-            patient_name=params['patient_name'],
-            patient_phone=params['phone'],
-            appointment_date=appointment_date,
-            appointment_time=appointment_time,
-            status='confirmed',
-            booking_method='voice_assistant',
-            notes=params.get('symptoms', '')
-        )
+        # Create appointment, the unique slot constraint rejects double bookings
+        try:
+            with transaction.atomic():
+                appointment = Appointment.objects.create(
+                    doctor=doctor,
+                    patient_name=patient_name,
+                    patient_phone=phone,
+                    appointment_date=appointment_date,
+                    appointment_time=appointment_time,
+                    status='confirmed',
+                    notes=params.get('symptoms', '')
+                )
+        except IntegrityError:
+            return slot_unavailable
 
         return {
             "status": "success",
@@ -179,9 +219,9 @@ class DatabaseActionHandler:
                 "booking_id": f"APT{appointment.id:06d}",
                 "doctor_name": doctor.name,
                 "doctor_specialization": doctor.specialization.name if doctor.specialization else "",
-                "patient_name": params['patient_name'],
-                "appointment_date": params['date'],
-                "appointment_time": params['time'],
+                "patient_name": patient_name,
+                "appointment_date": date_str,
+                "appointment_time": time_str,
                 "status": "confirmed"
             }
         }
@@ -210,27 +250,31 @@ class DatabaseActionHandler:
                 "data": None
             }
 
-        appointments = Appointment.objects.filter(query).select_related('doctor', 'doctor__specialization').order_by('-appointment_date')
+        appointments = list(Appointment.objects.filter(query).order_by('-appointment_date').values(
+            'id', 'patient_name', 'appointment_date', 'appointment_time', 'status',
+            'doctor__name', 'doctor__specialization__name'
+        ))
 
-        if not appointments.exists():
+        if not appointments:
             return {
                 "status": "success",
                 "message": "No appointments found",
                 "data": []
             }
 
-        appointments_data = []
-        for apt in appointments:
-            appointments_data.append({
-                "appointment_id": apt.id,
-                "booking_id": f"APT{apt.id:06d}",
-                "doctor_name": apt.doctor.name,
-                "doctor_specialization": apt.doctor.specialization.name if apt.doctor.specialization else "",
-                "patient_name": apt.patient_name,
-                "appointment_date": apt.appointment_date.strftime('%Y-%m-%d'),
-                "appointment_time": apt.appointment_time.strftime('%I:%M %p'),
-                "status": apt.status
-            })
+        appointments_data = [
+            {
+                "appointment_id": apt['id'],
+                "booking_id": "APT" + str(apt['id']).zfill(6),
+                "doctor_name": apt['doctor__name'],
+                "doctor_specialization": apt['doctor__specialization__name'] or "",
+                "patient_name": apt['patient_name'],
+                "appointment_date": apt['appointment_date'].isoformat(),
+                "appointment_time": format_time(apt['appointment_time']),
+                "status": apt['status']
+            }
+            for apt in appointments
+        ]
 
         return {
             "status": "success",
@@ -253,42 +297,44 @@ class DatabaseActionHandler:
                 "data": None
             }
 
-        try:
-            appointment = Appointment.objects.get(
-                id=params['appointment_id'],
-                patient_phone=params['phone']
-            )
+        appointment = Appointment.objects.filter(
+            id=params['appointment_id'],
+            patient_phone=params['phone']
+        ).values('id', 'status', 'appointment_date', 'appointment_time', 'doctor_id', 'doctor__name').first()
 
-            # Check if already cancelled
-            if appointment.status == 'cancelled':
-                return {
-                    "status": "success",
-                    "message": "Appointment was already cancelled",
-                    "data": {"appointment_id": appointment.id}
-                }
-
-            # Cancel appointment
-            appointment.status = 'cancelled'
-            appointment.save()
+        if not appointment:
+            return {
+                "status": "error",
+                "message": "Appointment not found or phone number doesn't match",
+                "data": None
+            }
 
+        # Check if already cancelled
+        if appointment['status'] == 'cancelled':
             return {
                 "status": "success",
-                "message": "Appointment cancelled successfully",
-                "data": {
-                    "appointment_id": appointment.id,
-                    "booking_id": f"APT{appointment.id:06d}",
-                    "doctor_name": appointment.doctor.name,
-                    "original_date": appointment.appointment_date.strftime('%Y-%m-%d'),
-                    "original_time": appointment.appointment_time.strftime('%I:%M %p')
-                }
+                "message": "Appointment was already cancelled",
+                "data": {"appointment_id": appointment['id']}
             }
 
-        except Appointment.DoesNotExist:
-            return {
-                "status": "error",
-                "message": "Appointment not found or phone number doesn't match",
-                "data": None
+        # Cancel appointment
+        Appointment.objects.filter(id=appointment['id']).update(
+            status='cancelled',
+            updated_at=timezone.now()
+        )
+        self._clear_available_slots(appointment['doctor_id'], appointment['appointment_date'])
+
+        return {
+            "status": "success",
+            "message": "Appointment cancelled successfully",
+            "data": {
+                "appointment_id": appointment['id'],
+                "booking_id": f"APT{appointment['id']:06d}",
+                "doctor_name": appointment['doctor__name'],
+                "original_date": appointment['appointment_date'].isoformat(),
+                "original_time": format_time(appointment['appointment_time'])
             }
+        }
 
     def reschedule_appointment(self, params: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -311,39 +357,45 @@ class DatabaseActionHandler:
             }
 
         try:
-            appointment = Appointment.objects.get(
-                id=params['appointment_id'],
-                patient_phone=params['phone']
-            )
-
-            # Parse new date and time
-            new_date = datetime.strptime(params['new_date'], '%Y-%m-%d').date()
-            new_time = datetime.strptime(params['new_time'], '%I:%M %p').time()
-
-            # Validate new date
-            if new_date < timezone.now().date():
-                return {
-                    "status": "error",
-                    "message": "New appointment date must be in the future",
-                    "data": None
-                }
-
-            # Check availability for new slot
-            is_available = self._check_slot_availability(appointment.doctor, new_date, new_time, exclude_appointment_id=appointment.id)
-            if not is_available:
-                return {
-                    "status": "error",
-                    "message": "Selected time slot is not available",
-                    "data": None
-                }
-
-            # Update appointment
-            old_date = appointment.appointment_date.strftime('%Y-%m-%d')
-            old_time = appointment.appointment_time.strftime('%I:%M %p')
-
-            appointment.appointment_date = new_date
-            appointment.appointment_time = new_time
-            appointment.save()
+            with transaction.atomic():
+                # Lock the row so the availability check and update can't race
+                appointment = Appointment.objects.select_for_update(of=('self',)).select_related('doctor').get(
+                    id=params['appointment_id'],
+                    patient_phone=params['phone']
+                )
+
+                # Parse new date and time
+                new_date = _parse_date(params['new_date'])
+                new_time = _parse_time(params['new_time'])
+
+                # Validate new date
+                if new_date < timezone.localdate():
+                    return {
+                        "status": "error",
+                        "message": "New appointment date must be in the future",
+                        "data": None
+                    }
+
+                # Check availability for new slot
+                is_available = self._check_slot_availability(appointment.doctor, new_date, new_time, exclude_appointment_id=appointment.id)
+                if not is_available:
+                    return {
+                        "status": "error",
+                        "message": "Selected time slot is not available",
+                        "data": None
+                    }
+
+                # Update appointment
+                old_date = appointment.appointment_date.isoformat()
+                old_time = format_time(appointment.appointment_time)
+
+                Appointment.objects.filter(id=appointment.id).update(
+                    appointment_date=new_date,
+                    appointment_time=new_time,
+                    updated_at=timezone.now()
+                )
+                self._clear_available_slots(appointment.doctor_id, appointment.appointment_date)
+                self._clear_available_slots(appointment.doctor_id, new_date)
 
             return {
                 "status": "success",
@@ -371,6 +423,12 @@ class DatabaseActionHandler:
                 "message": f"Invalid date or time format: {str(e)}",
                 "data": None
             }
+        except IntegrityError:
+            return {
+                "status": "error",
+                "message": "Selected time slot is not available",
+                "data": None
+            }
 
     # ========================
     # DOCTOR OPERATIONS
@@ -391,16 +449,18 @@ class DatabaseActionHandler:
         query = Q(is_active=True)
 
         if params.get('doctor_name'):
-            # Fuzzy name matching
-            all_doctors = Doctor.objects.filter(is_active=True)
-            matched_doctors = []
-
-            for doctor in all_doctors:
-                similarity = SequenceMatcher(None, params['doctor_name'].lower(), doctor.name.lower()).ratio()
-                if similarity > 0.7:  # 70% match threshold
-                    matched_doctors.append(doctor)
+            # Fuzzy name matching, scored in one batch call
+            all_doctors = self._active_doctor_names()
+            matches = process.extract(
+                params['doctor_name'].lower(),
+                [doctor_name.lower() for _, doctor_name in all_doctors],
+                scorer=fuzz.ratio,
+                score_cutoff=70,  # 70% match threshold
+                limit=None
+            )
+            matched_ids = [all_doctors[index][0] for _, _, index in matches]
 
-            doctors = matched_doctors
+            doctors = Doctor.objects.filter(id__in=matched_ids)
         else:
             if params.get('specialization'):
                 try:
@@ -409,24 +469,28 @@ class DatabaseActionHandler:
                 except Specialization.DoesNotExist:
                     pass
 
-            doctors = Doctor.objects.filter(query).select_related('specialization')
+            doctors = Doctor.objects.filter(query)
 
-        if not doctors:
+        # Stream rows straight into the response without a queryset cache
+        doctors_data = [
+            {
+                "id": doctor['id'],
+                "name": doctor['name'],
+                "specialization": doctor['specialization__name'] or "General Physician",
+                "consultation_fee": str(doctor['consultation_fee']) if doctor['consultation_fee'] else None
+            }
+            for doctor in doctors.values(
+                'id', 'name', 'specialization__name', 'consultation_fee'
+            ).iterator(chunk_size=100)
+        ]
+
+        if not doctors_data:
             return {
                 "status": "success",
                 "message": "No doctors found matching criteria",
                 "data": {"doctors": []}
             }
 
-        doctors_data = []
-        for doctor in doctors:
-            doctors_data.append({
-                "id": doctor.id,
-                "name": doctor.name,
-                "specialization": doctor.specialization.name if doctor.specialization else "General Physician",
-                "consultation_fee": str(doctor.consultation_fee) if doctor.consultation_fee else None
-            })
-
         return {
             "status": "success",
             "message": f"Found {len(doctors_data)} doctor(s)",
@@ -446,37 +510,42 @@ class DatabaseActionHandler:
 
         if not symptoms:
             # Return general physicians
-            doctors = Doctor.objects.filter(
-                is_active=True,
-                specialization__name__icontains="General"
-            ).select_related('specialization')[:3]
+            doctor_filter = Q(specialization__name__icontains="General")
         else:
             # Match symptoms to specializations
-            symptom_text = ' '.join(symptoms).lower()
+            symptom_set = {symptom.strip().lower() for symptom in symptoms}
+
+            # Try to find matching specialization, exact keyword hits first
+            specializations, keyword_index = self._specialization_index()
+            hits = Counter(
+                position
+                for symptom in symptom_set
+                for position in keyword_index.get(symptom, ())
+            )
 
-            # Try to find matching specialization
-            specializations = Specialization.objects.all()
-            matched_spec = None
-            max_match = 0
+            if hits:
+                # Most hits wins, ties go to the first specialization by name
+                matched_spec = specializations[min(hits, key=lambda position: (-hits[position], position))]
+            else:
+                # No exact hits, fall back to substring matching
+                matched_spec = None
+                max_match = 0
 
-            for spec in specializations:
-                keywords = spec.keywords.lower() if spec.keywords else ""
-                match_count = sum(1 for symptom in symptoms if symptom.lower() in keywords)
-                if match_count > max_match:
-                    max_match = match_count
-                    matched_spec = spec
+                for spec in specializations:
+                    match_count = sum(1 for symptom in symptom_set if symptom in spec['keywords'])
+                    if match_count > max_match:
+                        max_match = match_count
+                        matched_spec = spec
 
             if matched_spec:
-                doctors = Doctor.objects.filter(
-                    is_active=True,
-                    specialization=matched_spec
-                ).select_related('specialization')[:3]
+                doctor_filter = Q(specialization_id=matched_spec['id'])
             else:
                 # Default to general physician
-                doctors = Doctor.objects.filter(
-                    is_active=True,
-                    specialization__name__icontains="General"
-                ).select_related('specialization')[:3]
+                doctor_filter = Q(specialization__name__icontains="General")
+
+        doctors = list(Doctor.objects.filter(doctor_filter, is_active=True).values(
+            'id', 'name', 'specialization__name', 'consultation_fee'
+        )[:3])
 
         if not doctors:
             return {
@@ -485,14 +554,15 @@ class DatabaseActionHandler:
                 "data": {"doctors": []}
             }
 
-        doctors_data = []
-        for doctor in doctors:
-            doctors_data.append({
-                "id": doctor.id,
-                "name": doctor.name,
-                "specialization": doctor.specialization.name if doctor.specialization else "General Physician",
-                "consultation_fee": str(doctor.consultation_fee) if doctor.consultation_fee else None
-            })
+        doctors_data = [
+            {
+                "id": doctor['id'],
+                "name": doctor['name'],
+                "specialization": doctor['specialization__name'] or "General Physician",
+                "consultation_fee": str(doctor['consultation_fee']) if doctor['consultation_fee'] else None
+            }
+            for doctor in doctors
+        ]
 
         return {
             "status": "success",
@@ -512,7 +582,7 @@ class DatabaseActionHandler:
         doctor = None
         if params.get('doctor_id'):
             try:
-                doctor = Doctor.objects.get(id=params['doctor_id'], is_active=True)
+                doctor = self._doctor_queryset().get(id=params['doctor_id'], is_active=True)
             except Doctor.DoesNotExist:
                 return {
                     "status": "error",
@@ -531,7 +601,7 @@ class DatabaseActionHandler:
 
         # Parse date
         try:
-            check_date = datetime.strptime(params['date'], '%Y-%m-%d').date()
+            check_date = _parse_date(params['date'])
         except ValueError:
             return {
                 "status": "error",
@@ -540,7 +610,11 @@ class DatabaseActionHandler:
             }
 
         # Get available slots
-        available_slots = self._get_available_slots(doctor, check_date)
+        available_slots = cache.get_or_set(
+            AVAILABLE_SLOTS_CACHE_KEY.format(doctor_id=doctor.id, date=check_date.isoformat()),
+            lambda: self._get_available_slots(doctor, check_date),
+            AVAILABLE_SLOTS_CACHE_TIMEOUT
+        )
 
         return {
             "status": "success",
@@ -556,20 +630,92 @@ class DatabaseActionHandler:
     # HELPER METHODS
     # ========================
 
+    def _doctor_queryset(self):
+        """Doctors with only the columns the handlers read, specialization joined."""
+        return Doctor.objects.select_related('specialization').only('id', 'name', 'specialization__name')
+
     def _find_doctor_by_name(self, name: str) -> Optional[Doctor]:
         """Find doctor by name using fuzzy matching."""
-        all_doctors = Doctor.objects.filter(is_active=True)
+        # Exact names (the usual case) resolve in a single query
+        doctor = self._doctor_queryset().filter(is_active=True, name__iexact=name).first()
+        if doctor:
+            return doctor
+
+        all_doctors = self._active_doctor_names()
+
+        best_match = process.extractOne(
+            name.lower(),
+            [doctor_name.lower() for _, doctor_name in all_doctors],
+            scorer=fuzz.ratio,
+            score_cutoff=70  # 70% threshold
+        )
+
+        if not best_match:
+            return None
+
+        return self._doctor_queryset().get(id=all_doctors[best_match[2]][0])
+
+    def _specialization_index(self) -> Tuple[List[Dict[str, Any]], Dict[str, tuple]]:
+        """
+        Get every specialization (id, name, lowercased keywords) plus an
+        inverted index of keyword -> positions in that list (cached).
+        """
+        return cache.get_or_set(
+            SPECIALIZATIONS_CACHE_KEY,
+            self._build_specialization_index,
+            REFERENCE_DATA_CACHE_TIMEOUT
+        )
 
-        best_match = None
-        best_similarity = 0
+    def _build_specialization_index(self) -> Tuple[List[Dict[str, Any]], Dict[str, tuple]]:
+        """Load specializations and build the keyword inverted index."""
+        specializations = []
+        keyword_index = {}
 
-        for doctor in all_doctors:
-            similarity = SequenceMatcher(None, name.lower(), doctor.name.lower()).ratio()
-            if similarity > best_similarity and similarity > 0.7:  # 70% threshold
-                best_similarity = similarity
-                best_match = doctor
+        for position, spec in enumerate(Specialization.objects.only('id', 'name', 'keywords')):
+            specializations.append({
+                'id': spec.id,
+                'name': spec.name,
+                'keywords': spec.keywords.lower()
+            })
+            for keyword in set(spec.get_keywords_list()):
+                keyword_index[keyword] = keyword_index.get(keyword, ()) + (position,)
 
-        return best_match
+        return specializations, keyword_index
+
+    def _active_doctor_names(self) -> List[tuple]:
+        """Get (id, name) pairs of all active doctors (cached)."""
+        return cache.get_or_set(
+            ACTIVE_DOCTOR_NAMES_CACHE_KEY,
+            lambda: list(Doctor.objects.filter(is_active=True).values_list('id', 'name')),
+            REFERENCE_DATA_CACHE_TIMEOUT
+        )
+
+    def _get_schedule(self, doctor: Doctor, date: datetime.date) -> Optional[tuple]:
+        """Get (start_time, end_time, slot_duration) of the doctor's schedule for the date's weekday (cached)."""
+        weekday = date.weekday()
+        return cache.get_or_set(
+            SCHEDULE_CACHE_KEY.format(doctor_id=doctor.id, weekday=weekday),
+            lambda: DoctorSchedule.objects.filter(
+                doctor=doctor,
+                day_of_week=weekday
+            ).values_list('start_time', 'end_time', 'slot_duration').first(),
+            REFERENCE_DATA_CACHE_TIMEOUT
+        )
+
+    def _clear_available_slots(self, doctor_id: int, date: dt_date):
+        """Drop cached available slots for a doctor/date once the write commits."""
+        key = AVAILABLE_SLOTS_CACHE_KEY.format(doctor_id=doctor_id, date=date.isoformat())
+        transaction.on_commit(lambda: cache.delete(key))
+
+    def _is_within_schedule(self, doctor: Doctor, date: dt_date, time: dt_time) -> bool:
+        """Check if the time falls inside the doctor's schedule for that day."""
+        schedule = self._get_schedule(doctor, date)
+
+        if not schedule:
+            return False
+
+        start_time, end_time, _ = schedule
+        return start_time <= time < end_time
 
     def _check_slot_availability(
         self,
@@ -579,18 +725,7 @@ class DatabaseActionHandler:
         exclude_appointment_id: int = None
     ) -> bool:
         """Check if a specific time slot is available."""
-        # Check if doctor has schedule for this day
-        weekday = date.strftime('%A')
-        schedule = DoctorSchedule.objects.filter(
-            doctor=doctor,
-            day_of_week=weekday
-        ).first()
-
-        if not schedule:
-            return False
-
-        # Check if time is within schedule
-        if time < schedule.start_time or time >= schedule.end_time:
+        if not self._is_within_schedule(doctor, date, time):
             return False
 
         # Check if slot is already booked
@@ -610,34 +745,31 @@ class DatabaseActionHandler:
 
     def _get_available_slots(self, doctor: Doctor, date: datetime.date) -> List[str]:
         """Get all available time slots for a doctor on a specific date."""
-        weekday = date.strftime('%A')
-        schedule = DoctorSchedule.objects.filter(
-            doctor=doctor,
-            day_of_week=weekday
-        ).first()
+        schedule = self._get_schedule(doctor, date)
 
         if not schedule:
             return []
 
         # Generate all possible slots
+        start_time, end_time, slot_duration = schedule
         slots = []
-        current_time = datetime.combine(date, schedule.start_time)
-        end_time = datetime.combine(date, schedule.end_time)
-        slot_duration = schedule.slot_duration or 30  # Default 30 minutes
+        current_time = datetime.combine(date, start_time)
+        end_time = datetime.combine(date, end_time)
+        slot_duration = slot_duration or 30  # Default 30 minutes
 
         while current_time < end_time:
             slots.append(current_time.time())
             current_time += timedelta(minutes=slot_duration)
 
         # Filter out booked slots
-        booked_times = Appointment.objects.filter(
+        booked_times = set(Appointment.objects.filter(
             doctor=doctor,
             appointment_date=date,
             status__in=['pending', 'confirmed']
-        ).values_list('appointment_time', flat=True)
+        ).values_list('appointment_time', flat=True))
 
         available_slots = [
-            slot.strftime('%I:%M %p')
+            format_time(slot)
             for slot in slots
             if slot not in booked_times
         ]
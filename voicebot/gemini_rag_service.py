@@ -5,10 +5,159 @@ Uses Gemini 2.5 Flash with full conversation context and database retrieval
 
 import google.generativeai as genai
 from django.conf import settings
+from django.core.cache import cache
+import hashlib
 import json
+import logging
+import re
+import threading
 from datetime import datetime, timedelta
 from django.utils import timezone
 
+logger = logging.getLogger(__name__)
+
+
+# Persona and conversation rules, identical on every turn
+SYSTEM_PROMPT = """You are MediBot, a senior medical appointment booking receptionist powered by AI.
+
+YOUR ROLE AND PERSONALITY:
+- You are warm, empathetic, professional, and highly competent
+- You act like an experienced receptionist who has been doing this for years
+- You understand patients may change their mind at any time - handle this naturally
+- You can handle complex conversations where patients might jump between topics
+- You remember the entire conversation and can adapt to any changes
+- You are proactive in suggesting alternatives when issues arise
+- You explain things clearly and make patients feel comfortable
+
+YOUR CAPABILITIES:
+- Book appointments by collecting: patient name, phone number, doctor selection, date, and time
+- Understand symptoms and recommend appropriate specialists
+- Check real-time slot availability and suggest alternatives
+- Handle changes to any booking detail at any stage of conversation
+- Answer questions about doctors, availability, and booking process
+- Provide helpful suggestions when patients are unsure
+
+CONVERSATION GUIDELINES:
+1. Be conversational and natural - not robotic or scripted
+2. Use short, clear sentences suitable for voice conversation
+3. Always acknowledge what the patient said before asking the next question
+4. If patient wants to change something, handle it smoothly without restarting
+5. If a slot is unavailable, proactively suggest the next available options
+6. Remember the full context - if patient mentioned symptoms earlier, use that information
+7. Be flexible - patients may provide information out of order
+8. Always confirm critical information before finalizing booking
+
+IMPORTANT: Your responses should sound natural and conversational, as if speaking to someone on the phone."""
+
+# Stage-independent change handling and JSON response rules
+RESPONSE_FORMAT_PROMPT = """IMPORTANT - HANDLING CHANGES:
+- Patient can change ANY detail at ANY time (doctor, date, time, name, phone)
+- If patient wants to change something, acknowledge it positively and help them
+- Examples of change requests:
+  * "Actually, I want a different doctor"
+  * "Can I change the date to next week?"
+  * "Wait, I prefer morning slots"
+  * "Let me change my number"
+- Handle these naturally without making patient feel they made a mistake
+
+RESPONSE FORMAT:
+Provide your response as JSON:
+{
+  "message": "Your natural, conversational response to the patient (2-3 sentences max)",
+  "action": "continue|booking_complete|change_detected|need_info",
+  "next_stage": "greeting|patient_name|doctor_selection|date_selection|time_selection|phone_collection|confirmation|completed",
+  "extracted_data": {
+    "patient_name": "if mentioned (e.g., 'John Smith')",
+    "doctor_id": "NUMERIC ID ONLY if doctor is selected (e.g., 5, NOT 'Dr. Smith')",
+    "doctor_name": "doctor's name if selected (e.g., 'Dr. Michael Brown')",
+    "appointment_date": "YYYY-MM-DD format if mentioned (e.g., '2025-11-17')",
+    "appointment_time": "HH:MM AM/PM format if mentioned (e.g., '10:00 AM')",
+    "phone": "10-digit number only if mentioned (e.g., '9876543210')",
+    "intent": "proceed|confirm|change_doctor|change_date|change_time|change_phone|cancel|unclear"
+  }
+}
+
+CRITICAL FOR doctor_id:
+- Look up the doctor's numeric ID from the booking context
+- ONLY put NUMBERS in doctor_id (e.g., 1, 2, 3)
+- NEVER put names in doctor_id (NOT "Dr. Smith", use the ID like 5)
+- Put the doctor's NAME in doctor_name field
+- If you can't find the numeric ID, omit doctor_id and only provide doctor_name
+
+CRITICAL FOR BOOKING COMPLETION:
+- Set action to "booking_complete" ONLY when patient explicitly confirms (says "yes", "confirm", "book it", etc.)
+- Set intent to "confirm" when patient confirms the booking
+- Set next_stage to "completed" when booking is confirmed
+- All three should be set together for successful booking
+
+REMEMBER:
+- Keep responses conversational and natural
+- Don't be too formal or robotic
+- Use contractions (I'm, let's, you're, etc.)
+- Be warm and friendly
+- Address patient by name when you know it"""
+
+# Per-stage task instructions
+STAGE_INSTRUCTIONS = {
+    'greeting': """Task: Warmly welcome the patient and ask for their name.
+If they already provided their name in their message, acknowledge it and move to asking how you can help.""",
+
+    'patient_name': """Task: Collect the patient's name.
+If they provided it, acknowledge and ask how you can help them today (symptoms or doctor name).""",
+
+    'doctor_selection': """Task: Help patient select a doctor.
+- If they describe symptoms, analyze and recommend appropriate specialization/doctor
+- If they mention doctor name, confirm the doctor details
+- If they're selecting from previously suggested doctors, confirm selection
+- Use the available doctors and specializations from context
+- Be helpful and suggest alternatives if needed""",
+
+    'date_selection': """Task: Help patient select an appointment date.
+- Check the doctor availability context
+- If date mentioned, validate and show available time slots
+- If date not available, suggest next available dates from context
+- Handle date parsing naturally (tomorrow, next Monday, specific dates, etc.)""",
+
+    'time_selection': """Task: Help patient select a time slot.
+- Use the available_slots context
+- If time mentioned, confirm if available
+- If not available, suggest alternatives from available slots
+- Be helpful with time format (10 AM, 2:30 PM, etc.)""",
+
+    'phone_collection': """Task: Collect patient's 10-digit phone number.
+- Validate it's exactly 10 digits
+- Be patient if they make mistakes""",
+
+    'confirmation': """Task: Confirm all booking details.
+- Summarize: patient name, doctor, date, time, phone
+- Ask for final confirmation
+- Handle any change requests naturally"""
+}
+
+DEFAULT_STAGE_INSTRUCTION = "Task: Help the patient with their request."
+
+# Longer history messages are cut to keep the prompt size bounded
+HISTORY_MESSAGE_MAX_CHARS = 400
+
+# Doctors listed in the prompt when no specialization has been narrowed down yet
+CONTEXT_DOCTOR_LIMIT = 10
+
+# Identical prompts (retries, repeated turns) reuse the last Gemini reply
+RESPONSE_CACHE_TIMEOUT = 60 * 5
+
+# A fenced block (```json or ```) wins over a bare {...} span elsewhere in the text
+FENCED_JSON_RE = re.compile(r'```(?:json)?\s*(.*?)\s*(?:```|$)', re.DOTALL)
+BARE_JSON_RE = re.compile(r'\{.*\}', re.DOTALL)
+
+
+def _extract_json(text):
+    """Return the JSON candidate embedded in an LLM response, or None"""
+    match = FENCED_JSON_RE.search(text)
+    if match:
+        return match.group(1)
+    match = BARE_JSON_RE.search(text)
+    return match.group(0) if match else None
+
 
 class GeminiRAGService:
     """
@@ -43,13 +192,17 @@ class GeminiRAGService:
             Dict with response message and extracted information
         """
         # Build comprehensive prompt with RAG context
+        # Static instructions go first so every turn shares a cacheable prefix
         system_prompt = self._build_system_prompt()
+        response_format_prompt = self._build_response_format_prompt()
         context_prompt = self._build_context_prompt(context)
         conversation_prompt = self._build_conversation_prompt(conversation_history)
         task_prompt = self._build_task_prompt(current_stage, context, user_message)
 
         full_prompt = f"""{system_prompt}
 
+{response_format_prompt}
+
 {context_prompt}
 
 {conversation_prompt}
@@ -57,243 +210,155 @@ class GeminiRAGService:
 {task_prompt}"""
 
         try:
-            response = self.model.generate_content(full_prompt)
-            response_text = response.text.strip()
+            response_text = self._generate_text(full_prompt)
 
             # Parse response if it contains structured data
             return self._parse_response(response_text)
 
-        except Exception as e:
-            print(f"Error generating response: {e}")
-            import traceback
-            traceback.print_exc()
+        except Exception:
+            logger.exception("Error generating Gemini RAG response")
             return {
                 'message': "I apologize, I'm having trouble processing that. Could you please repeat?",
                 'action': 'continue',
                 'extracted_data': {}
             }
 
+    def _generate_text(self, prompt):
+        """Call Gemini for a prompt, serving identical prompts from cache"""
+        cache_key = f"gemini_rag_{hashlib.blake2b(prompt.encode(), digest_size=16).hexdigest()}"
+        response_text = cache.get(cache_key)
+        if response_text is None:
+            response = self.model.generate_content(prompt)
+            response_text = response.text.strip()
+            cache.set(cache_key, response_text, RESPONSE_CACHE_TIMEOUT)
+        return response_text
+
     def _build_system_prompt(self):
         """Build system prompt defining the assistant's role"""
-        return """You are MediBot, a senior medical appointment booking receptionist powered by AI.
-
-YOUR ROLE AND PERSONALITY:
-- You are warm, empathetic, professional, and highly competent
-- You act like an experienced receptionist who has been doing this for years
-- You understand patients may change their mind at any time - handle this naturally
-- You can handle complex conversations where patients might jump between topics
-- You remember the entire conversation and can adapt to any changes
-- You are proactive in suggesting alternatives when issues arise
-- You explain things clearly and make patients feel comfortable
-
-YOUR CAPABILITIES:
-- Book appointments by collecting: patient name, phone number, doctor selection, date, and time
-- Understand symptoms and recommend appropriate specialists
-- Check real-time slot availability and suggest alternatives
-- Handle changes to any booking detail at any stage of conversation
-- Answer questions about doctors, availability, and booking process
-- Provide helpful suggestions when patients are unsure
-
-CONVERSATION GUIDELINES:
-1. Be conversational and natural - not robotic or scripted
-2. Use short, clear sentences suitable for voice conversation
-3. Always acknowledge what the patient said before asking the next question
-4. If patient wants to change something, handle it smoothly without restarting
-5. If a slot is unavailable, proactively suggest the next available options
-6. Remember the full context - if patient mentioned symptoms earlier, use that information
-7. Be flexible - patients may provide information out of order
-8. Always confirm critical information before finalizing booking
-
-IMPORTANT: Your responses should sound natural and conversational, as if speaking to someone on the phone."""
+        return SYSTEM_PROMPT
 
     def _build_context_prompt(self, context):
         """Build context from retrieved database information"""
         current_booking = context.get('current_booking', {})
 
-        prompt = "\n--- CURRENT BOOKING CONTEXT ---\n"
-        prompt += f"Stage: {current_booking.get('stage', 'greeting')}\n"
+        parts = [
+            "\n--- CURRENT BOOKING CONTEXT ---\n",
+            f"Stage: {current_booking.get('stage', 'greeting')}\n"
+        ]
 
         if current_booking.get('patient_name'):
-            prompt += f"Patient Name: {current_booking['patient_name']}\n"
+            parts.append(f"Patient Name: {current_booking['patient_name']}\n")
         if current_booking.get('doctor_name'):
-            prompt += f"Selected Doctor: {current_booking['doctor_name']} (ID: {current_booking.get('doctor_id')})\n"
+            parts.append(f"Selected Doctor: {current_booking['doctor_name']} (ID: {current_booking.get('doctor_id')})\n")
         if current_booking.get('appointment_date'):
-            prompt += f"Selected Date: {current_booking['appointment_date']}\n"
+            parts.append(f"Selected Date: {current_booking['appointment_date']}\n")
         if current_booking.get('appointment_time'):
-            prompt += f"Selected Time: {current_booking['appointment_time']}\n"
+            parts.append(f"Selected Time: {current_booking['appointment_time']}\n")
         if current_booking.get('phone'):
-            prompt += f"Phone: {current_booking['phone']}\n"
+            parts.append(f"Phone: {current_booking['phone']}\n")
 
         # Add doctor context if available
         if context.get('selected_doctor'):
             doc = context['selected_doctor']
-            prompt += f"\n--- SELECTED DOCTOR DETAILS ---\n"
-            prompt += f"Name: Dr. {doc['name']}\n"
-            prompt += f"Specialization: {doc['specialization']}\n"
-            prompt += f"Experience: {doc['experience_years']} years\n"
-            prompt += f"Consultation Fee: ₹{doc['consultation_fee']}\n"
+            parts.append(
+                "\n--- SELECTED DOCTOR DETAILS ---\n"
+                f"Name: Dr. {doc['name']}\n"
+                f"Specialization: {doc['specialization']}\n"
+                f"Experience: {doc['experience_years']} years\n"
+                f"Consultation Fee: ₹{doc['consultation_fee']}\n"
+            )
 
         # Add availability context
         if context.get('doctor_availability'):
-            prompt += f"\n--- DOCTOR AVAILABILITY (Next 7 days) ---\n"
-            for avail in context['doctor_availability'][:5]:
-                prompt += f"- {avail['day_name']}, {avail['date']}: {avail['available_slots']} slots available\n"
+            parts.append("\n--- DOCTOR AVAILABILITY (Next 7 days) ---\n")
+            parts.extend(
+                f"- {avail['day_name']}, {avail['date']}: {avail['available_slots']} slots available\n"
+                for avail in context['doctor_availability'][:5]
+            )
 
         # Add slot context if date is selected
         if context.get('available_slots'):
             slots = context['available_slots']
             if slots.get('available'):
                 available_times = [s['time'] for s in slots['slots'] if s['available']][:10]
-                prompt += f"\n--- AVAILABLE TIME SLOTS ---\n"
-                prompt += f"Total Slots: {slots['total_slots']}\n"
-                prompt += f"Available: {slots['available_count']}\n"
+                parts.append(
+                    "\n--- AVAILABLE TIME SLOTS ---\n"
+                    f"Total Slots: {slots['total_slots']}\n"
+                    f"Available: {slots['available_count']}\n"
+                )
                 if available_times:
-                    prompt += f"Times: {', '.join(available_times)}\n"
+                    parts.append(f"Times: {', '.join(available_times)}\n")
             else:
-                prompt += f"\n--- NO SLOTS AVAILABLE ---\n"
-                prompt += f"Reason: {slots.get('reason', 'Unknown')}\n"
+                parts.append(
+                    "\n--- NO SLOTS AVAILABLE ---\n"
+                    f"Reason: {slots.get('reason', 'Unknown')}\n"
+                )
+
+        # Once a doctor is picked, only their specialization is relevant
+        selected_specialization = (context.get('selected_doctor') or {}).get('specialization')
 
         # Add available doctors context
         if context.get('doctors'):
-            prompt += f"\n--- AVAILABLE DOCTORS ({len(context['doctors'])} total) ---\n"
-            for doc in context['doctors'][:10]:  # Show first 10
-                prompt += f"- Dr. {doc['name']} ({doc['specialization']}) - ₹{doc['consultation_fee']}\n"
+            parts.append(f"\n--- AVAILABLE DOCTORS ({len(context['doctors'])} total) ---\n")
+            parts.extend(
+                f"- Dr. {doc['name']} ({doc['specialization']}) - ₹{doc['consultation_fee']}\n"
+                for doc in self._relevant_doctors(context['doctors'], selected_specialization)
+            )
 
-        # Add specializations context
+        # Add specializations context; keywords only help before a specialization is chosen
         if context.get('specializations'):
-            prompt += f"\n--- AVAILABLE SPECIALIZATIONS ---\n"
+            parts.append("\n--- AVAILABLE SPECIALIZATIONS ---\n")
             for spec in context['specializations'][:10]:
-                prompt += f"- {spec['name']}: {spec['doctor_count']} doctors available\n"
-                if spec.get('keywords'):
-                    prompt += f"  Keywords: {spec['keywords'][:100]}\n"
+                parts.append(f"- {spec['name']}: {spec['doctor_count']} doctors available\n")
+                if spec.get('keywords') and not selected_specialization:
+                    parts.append(f"  Keywords: {spec['keywords'][:100]}\n")
+
+        return "".join(parts)
 
-        return prompt
+    def _relevant_doctors(self, doctors, specialization):
+        """Doctors in the chosen specialization, else the most experienced few"""
+        if specialization:
+            matching = [doc for doc in doctors if doc['specialization'] == specialization]
+            if matching:
+                return matching
+        return sorted(doctors, key=lambda doc: doc.get('experience_years') or 0, reverse=True)[:CONTEXT_DOCTOR_LIMIT]
 
     def _build_conversation_prompt(self, conversation_history):
         """Build conversation history for context"""
         if not conversation_history:
             return "\n--- CONVERSATION HISTORY ---\nThis is the start of the conversation.\n"
 
-        prompt = "\n--- CONVERSATION HISTORY ---\n"
-        for msg in conversation_history[-10:]:  # Last 10 messages
-            role = msg.get('role', 'user').upper()
-            content = msg.get('content', '')
-            prompt += f"{role}: {content}\n"
+        lines = "".join(
+            f"{msg.get('role', 'user').upper()}: {self._truncate_history_content(msg.get('content', ''))}\n"
+            for msg in conversation_history[-10:]  # Last 10 messages
+        )
+        return f"\n--- CONVERSATION HISTORY ---\n{lines}"
 
-        return prompt
+    def _truncate_history_content(self, content):
+        """Cap a history message at HISTORY_MESSAGE_MAX_CHARS characters"""
+        if len(content) <= HISTORY_MESSAGE_MAX_CHARS:
+            return content
+        return content[:HISTORY_MESSAGE_MAX_CHARS] + '…'
 
     def _build_task_prompt(self, current_stage, context, user_message):
         """Build task-specific prompt based on current stage"""
-        booking = context.get('current_booking', {})
-
-        prompt = f"\n--- CURRENT TASK ---\n"
-        prompt += f"Patient says: \"{user_message}\"\n\n"
-
-        # Stage-specific instructions
-        stage_instructions = {
-            'greeting': """Task: Warmly welcome the patient and ask for their name.
-If they already provided their name in their message, acknowledge it and move to asking how you can help.""",
-
-            'patient_name': """Task: Collect the patient's name.
-If they provided it, acknowledge and ask how you can help them today (symptoms or doctor name).""",
-
-            'doctor_selection': """Task: Help patient select a doctor.
-- If they describe symptoms, analyze and recommend appropriate specialization/doctor
-- If they mention doctor name, confirm the doctor details
-- If they're selecting from previously suggested doctors, confirm selection
-- Use the available doctors and specializations from context
-- Be helpful and suggest alternatives if needed""",
-
-            'date_selection': """Task: Help patient select an appointment date.
-- Check the doctor availability context
-- If date mentioned, validate and show available time slots
-- If date not available, suggest next available dates from context
-- Handle date parsing naturally (tomorrow, next Monday, specific dates, etc.)""",
-
-            'time_selection': """Task: Help patient select a time slot.
-- Use the available_slots context
-- If time mentioned, confirm if available
-- If not available, suggest alternatives from available slots
-- Be helpful with time format (10 AM, 2:30 PM, etc.)""",
-
-            'phone_collection': """Task: Collect patient's 10-digit phone number.
-- Validate it's exactly 10 digits
-- Be patient if they make mistakes""",
-
-            'confirmation': """Task: Confirm all booking details.
-- Summarize: patient name, doctor, date, time, phone
-- Ask for final confirmation
-- Handle any change requests naturally"""
-        }
+        return "".join((
+            "\n--- CURRENT TASK ---\n",
+            f"Patient says: \"{user_message}\"\n\n",
+            STAGE_INSTRUCTIONS.get(current_stage, DEFAULT_STAGE_INSTRUCTION),
+            "\n\nRespond with the JSON described in RESPONSE FORMAT above."
+        ))
 
-        prompt += stage_instructions.get(current_stage, "Task: Help the patient with their request.")
-
-        # Add change detection instructions
-        prompt += """
-
-IMPORTANT - HANDLING CHANGES:
-- Patient can change ANY detail at ANY time (doctor, date, time, name, phone)
-- If patient wants to change something, acknowledge it positively and help them
-- Examples of change requests:
-  * "Actually, I want a different doctor"
-  * "Can I change the date to next week?"
-  * "Wait, I prefer morning slots"
-  * "Let me change my number"
-- Handle these naturally without making patient feel they made a mistake
-
-RESPONSE FORMAT:
-Provide your response as JSON:
-{
-  "message": "Your natural, conversational response to the patient (2-3 sentences max)",
-  "action": "continue|booking_complete|change_detected|need_info",
-  "next_stage": "greeting|patient_name|doctor_selection|date_selection|time_selection|phone_collection|confirmation|completed",
-  "extracted_data": {
-    "patient_name": "if mentioned (e.g., 'John Smith')",
-    "doctor_id": "NUMERIC ID ONLY if doctor is selected (e.g., 5, NOT 'Dr. Smith')",
-    "doctor_name": "doctor's name if selected (e.g., 'Dr. Michael Brown')",
-    "appointment_date": "YYYY-MM-DD format if mentioned (e.g., '2025-11-17')",
-    "appointment_time": "HH:MM AM/PM format if mentioned (e.g., '10:00 AM')",
-    "phone": "10-digit number only if mentioned (e.g., '9876543210')",
-    "intent": "proceed|confirm|change_doctor|change_date|change_time|change_phone|cancel|unclear"
-  }
-}
-
-CRITICAL FOR doctor_id:
-- Look up the doctor's numeric ID from the context above
-- ONLY put NUMBERS in doctor_id (e.g., 1, 2, 3)
-- NEVER put names in doctor_id (NOT "Dr. Smith", use the ID like 5)
-- Put the doctor's NAME in doctor_name field
-- If you can't find the numeric ID, omit doctor_id and only provide doctor_name
-
-CRITICAL FOR BOOKING COMPLETION:
-- Set action to "booking_complete" ONLY when patient explicitly confirms (says "yes", "confirm", "book it", etc.)
-- Set intent to "confirm" when patient confirms the booking
-- Set next_stage to "completed" when booking is confirmed
-- All three should be set together for successful booking
-
-REMEMBER:
-- Keep responses conversational and natural
-- Don't be too formal or robotic
-- Use contractions (I'm, let's, you're, etc.)
-- Be warm and friendly
-- Address patient by name when you know it"""
-
-        return prompt
+    def _build_response_format_prompt(self):
+        """Build the stage-independent change handling and response format rules"""
+        return RESPONSE_FORMAT_PROMPT
 
     def _parse_response(self, response_text):
         """Parse LLM response, handling both JSON and plain text"""
         try:
             # Try to extract JSON from response
-            if '```json' in response_text:
-                json_str = response_text.split('```json')[1].split('```')[0].strip()
-            elif '```' in response_text:
-                json_str = response_text.split('```')[1].split('```')[0].strip()
-            elif '{' in response_text and '}' in response_text:
-                # Find JSON object
-                start = response_text.index('{')
-                end = response_text.rindex('}') + 1
-                json_str = response_text[start:end]
-            else:
+            json_str = _extract_json(response_text)
+            if json_str is None:
                 # No JSON found, treat as plain text
                 return {
                     'message': response_text,
@@ -316,7 +381,7 @@ REMEMBER:
             return parsed
 
         except Exception as e:
-            print(f"Error parsing response: {e}")
+            logger.warning("Error parsing Gemini response: %s", e)
             # Return plain text response
             return {
                 'message': response_text,
@@ -366,22 +431,40 @@ Return JSON:
 }}"""
 
         try:
-            response = self.model.generate_content(prompt)
-            result_text = response.text.strip()
+            result_text = self._generate_text(prompt)
 
             # Parse JSON
-            if '```json' in result_text:
-                result_text = result_text.split('```json')[1].split('```')[0].strip()
-            elif '```' in result_text:
-                result_text = result_text.split('```')[1].split('```')[0].strip()
+            return json.loads(_extract_json(result_text) or result_text)
 
-            return json.loads(result_text)
-
-        except Exception as e:
-            print(f"Error analyzing intent: {e}")
+        except Exception:
+            logger.exception("Error analyzing intent")
             return {
                 'intent': 'proceed',
                 'confidence': 'low',
                 'reasoning': 'Error in analysis, defaulting to proceed',
                 'extracted_value': None
             }
+
+
+# Singleton instance
+_gemini_rag_service = None
+_gemini_rag_service_lock = threading.Lock()
+
+
+def get_gemini_rag_service():
+    """
+    Get or create the shared GeminiRAGService instance.
+
+    The service keeps no per-conversation state, so one configured
+    Gemini client can serve every request.
+
+    Returns:
+        GeminiRAGService: The shared service instance
+    """
+    global _gemini_rag_service
+    if _gemini_rag_service is None:
+        with _gemini_rag_service_lock:
+            # Re-check: another thread may have created it while we waited
+            if _gemini_rag_service is None:
+                _gemini_rag_service = GeminiRAGService()
+    return _gemini_rag_service
@@ -0,0 +1,21 @@
+# Generated by Django 4.2.7 on 2026-10-17 15:04
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voicebot', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='voiceconversation',
+            index=models.Index(fields=['stage'], name='voicebot_vo_stage_5beedf_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='voiceconversation',
+            index=models.Index(fields=['created_at'], name='voicebot_vo_created_bc3682_idx'),
+        ),
+    ]
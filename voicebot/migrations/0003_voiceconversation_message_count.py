@@ -0,0 +1,34 @@
+# Generated by Django 4.2.7 on 2026-10-17 15:08
+
+from django.db import migrations, models
+from django.db.models import Count, OuterRef, Subquery
+from django.db.models.functions import Coalesce
+
+
+def backfill_message_count(apps, schema_editor):
+    VoiceConversation = apps.get_model('voicebot', 'VoiceConversation')
+    ConversationMessage = apps.get_model('voicebot', 'ConversationMessage')
+
+    counts = ConversationMessage.objects.filter(
+        conversation=OuterRef('pk')
+    ).order_by().values('conversation').annotate(total=Count('id')).values('total')
+
+    VoiceConversation.objects.update(
+        message_count=Coalesce(Subquery(counts), 0)
+    )
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('voicebot', '0002_stage_created_at_indexes'),
+    ]
+
+    operations = [
+        migrations.AddField(
+            model_name='voiceconversation',
+            name='message_count',
+            field=models.PositiveIntegerField(default=0),
+        ),
+        migrations.RunPython(backfill_message_count, migrations.RunPython.noop),
+    ]
@@ -22,6 +22,9 @@ class VoiceConversation(models.Model):
     # Appointment reference
     appointment_id = models.IntegerField(blank=True, null=True)
 
+    # Number of ConversationMessage rows, kept in step with inserts
+    message_count = models.PositiveIntegerField(default=0)
+
     # Metadata
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
@@ -31,7 +34,9 @@ class VoiceConversation(models.Model):
         ordering = ['-updated_at']
         indexes = [
             models.Index(fields=['session_id']),
+            models.Index(fields=['stage']),
             models.Index(fields=['completed']),
+            models.Index(fields=['created_at']),
         ]
 
     def __str__(self):
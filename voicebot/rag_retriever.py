@@ -3,11 +3,24 @@ RAG Retriever - Database Context Retrieval for Appointment Booking
 Retrieves relevant information from database to provide context to LLM
 """
 
+import threading
 from datetime import datetime, timedelta, date
+from django.core.cache import cache
 from django.utils import timezone
 from django.db.models import Q, Count, F
 from doctors.models import Doctor, DoctorSchedule, Specialization, DoctorLeave
 from appointments.models import Appointment
+from voicebot.time_format import format_time
+
+# Context lists change rarely; signals drop them early on writes.
+DOCTORS_CONTEXT_CACHE_KEY = 'voicebot_rag_doctors'
+SPECIALIZATIONS_CONTEXT_CACHE_KEY = 'voicebot_rag_specializations'
+SPECIALIZATION_KEYWORDS_CACHE_KEY = 'voicebot_rag_specialization_keywords'
+DOCTOR_DETAILS_CACHE_KEY = 'voicebot_rag_doctor_{doctor_id}'
+CONTEXT_CACHE_TIMEOUT = 300
+
+# Slot totals per weekday only depend on the schedule; signals clear them on change.
+SLOT_TOTALS_CACHE_KEY = 'voicebot_rag_slot_totals_{doctor_id}'
 
 
 class RAGRetriever:
@@ -15,9 +28,6 @@ class RAGRetriever:
     Retrieves relevant context from database for RAG-based conversation
     """
 
-    def __init__(self):
-        self.cache = {}
-
     def get_all_context_for_conversation(self, session_data):
         """
         Retrieve all relevant context for current conversation state
@@ -54,42 +64,68 @@ class RAGRetriever:
 
     def get_all_doctors_context(self):
         """Get all active doctors with their details"""
-        doctors = Doctor.objects.filter(is_active=True).select_related('specialization')
+        return cache.get_or_set(
+            DOCTORS_CONTEXT_CACHE_KEY,
+            self._build_doctors_context,
+            CONTEXT_CACHE_TIMEOUT
+        )
+
+    def _build_doctors_context(self):
+        doctors = Doctor.objects.filter(is_active=True).values(
+            'id', 'name', 'qualification', 'experience_years', 'consultation_fee',
+            'specialization__name', 'specialization__keywords'
+        )
 
         return [
             {
-                'id': doc.id,
-                'name': doc.name,
-                'specialization': doc.specialization.name if doc.specialization else 'General',
-                'qualification': doc.qualification,
-                'experience_years': doc.experience_years,
-                'consultation_fee': float(doc.consultation_fee) if doc.consultation_fee else 0,
-                'keywords': doc.specialization.keywords if doc.specialization else ''
+                'id': doc['id'],
+                'name': doc['name'],
+                'specialization': doc['specialization__name'] or 'General',
+                'qualification': doc['qualification'],
+                'experience_years': doc['experience_years'],
+                'consultation_fee': float(doc['consultation_fee']) if doc['consultation_fee'] else 0,
+                'keywords': doc['specialization__keywords'] or ''
             }
             for doc in doctors
         ]
 
     def get_specializations_context(self):
         """Get all specializations with keywords for symptom matching"""
-        specializations = Specialization.objects.all()
+        return cache.get_or_set(
+            SPECIALIZATIONS_CONTEXT_CACHE_KEY,
+            self._build_specializations_context,
+            CONTEXT_CACHE_TIMEOUT
+        )
+
+    def _build_specializations_context(self):
+        specializations = Specialization.objects.annotate(
+            doctor_count=Count('doctors', filter=Q(doctors__is_active=True))
+        )
 
         return [
             {
                 'name': spec.name,
                 'description': spec.description,
                 'keywords': spec.keywords,
-                'doctor_count': Doctor.objects.filter(
-                    specialization=spec,
-                    is_active=True
-                ).count()
+                'doctor_count': spec.doctor_count
             }
             for spec in specializations
         ]
 
     def get_doctor_details(self, doctor_id):
         """Get detailed information about a specific doctor"""
+        return cache.get_or_set(
+            DOCTOR_DETAILS_CACHE_KEY.format(doctor_id=doctor_id),
+            lambda: self._build_doctor_details(doctor_id),
+            CONTEXT_CACHE_TIMEOUT
+        )
+
+    def _build_doctor_details(self, doctor_id):
         try:
-            doctor = Doctor.objects.select_related('specialization').get(id=doctor_id)
+            doctor = Doctor.objects.select_related('specialization').only(
+                'id', 'name', 'qualification', 'experience_years', 'consultation_fee',
+                'bio', 'phone', 'email', 'specialization__name'
+            ).get(id=doctor_id)
             return {
                 'id': doctor.id,
                 'name': doctor.name,
@@ -108,53 +144,77 @@ class RAGRetriever:
         """
         Get summary of doctor's availability for next N days
         """
-        try:
-            doctor = Doctor.objects.get(id=doctor_id)
-            today = timezone.now().date()
-            availability = []
+        today = timezone.localdate()
+        available_days = self._available_slots_by_date([doctor_id], today, days_ahead)[doctor_id]
 
-            for i in range(days_ahead):
-                check_date = today + timedelta(days=i)
-                slots = self.get_available_slots_count(doctor_id, check_date)
+        return [
+            {
+                'date': check_date.isoformat(),
+                'day_name': check_date.strftime('%A'),
+                'available_slots': slots
+            }
+            for check_date, slots in available_days[:7]  # Return next 7 days with availability
+        ]
 
-                if slots > 0:
-                    availability.append({
-                        'date': check_date.isoformat(),
-                        'day_name': check_date.strftime('%A'),
-                        'available_slots': slots
-                    })
+    def _available_slots_by_date(self, doctor_ids, start_date, days):
+        """
+        Map each doctor id to [(date, free_slots), ...] for the days in the
+        window that still have free slots, using one leave query and one
+        booked-count query for all doctors
+        """
+        last_date = start_date + timedelta(days=days - 1)
+        availability = {doctor_id: [] for doctor_id in doctor_ids}
+
+        slots_per_weekday = {doctor_id: self._weekday_slot_totals(doctor_id) for doctor_id in doctor_ids}
+        scheduled_ids = [doctor_id for doctor_id, totals in slots_per_weekday.items() if totals]
+
+        if not scheduled_ids:
+            return availability
+
+        leaves = {}
+        for doctor_id, leave_start, leave_end in DoctorLeave.objects.filter(
+            doctor_id__in=scheduled_ids,
+            start_date__lte=last_date,
+            end_date__gte=start_date
+        ).values_list('doctor_id', 'start_date', 'end_date'):
+            leaves.setdefault(doctor_id, []).append((leave_start, leave_end))
+
+        booked = {
+            (doctor_id, appointment_date): count
+            for doctor_id, appointment_date, count in Appointment.objects.filter(
+                doctor_id__in=scheduled_ids,
+                appointment_date__range=(start_date, last_date),
+                status__in=['pending', 'confirmed']
+            ).order_by().values_list('doctor_id', 'appointment_date').annotate(Count('id'))
+        }
 
-            return availability[:7]  # Return next 7 days with availability
+        for doctor_id in scheduled_ids:
+            doctor_leaves = leaves.get(doctor_id, [])
+            for i in range(days):
+                check_date = start_date + timedelta(days=i)
+                total_slots = slots_per_weekday[doctor_id].get(check_date.weekday(), 0)
 
-        except Doctor.DoesNotExist:
-            return []
+                if not total_slots or any(start <= check_date <= end for start, end in doctor_leaves):
+                    continue
+
+                slots = total_slots - booked.get((doctor_id, check_date), 0)
+                if slots > 0:
+                    availability[doctor_id].append((check_date, slots))
+
+        return availability
 
     def get_available_slots_count(self, doctor_id, date):
         """Count available slots for a doctor on a specific date"""
         try:
-            doctor = Doctor.objects.get(id=doctor_id)
-            day_name = date.strftime('%A')
-
-            # Get day of week (0=Monday, 6=Sunday)
-            day_mapping = {
-                'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 'Thursday': 3,
-                'Friday': 4, 'Saturday': 5, 'Sunday': 6
-            }
-            day_of_week = day_mapping.get(day_name, -1)
-
             # Check if doctor has schedule for this day
-            schedules = DoctorSchedule.objects.filter(
-                doctor=doctor,
-                day_of_week=day_of_week,
-                is_active=True
-            )
+            total_slots = self._weekday_slot_totals(doctor_id).get(date.weekday(), 0)
 
-            if not schedules.exists():
+            if not total_slots:
                 return 0
 
             # Check for leaves
             is_on_leave = DoctorLeave.objects.filter(
-                doctor=doctor,
+                doctor_id=doctor_id,
                 start_date__lte=date,
                 end_date__gte=date
             ).exists()
@@ -164,45 +224,40 @@ class RAGRetriever:
 
             # Count booked appointments
             booked_count = Appointment.objects.filter(
-                doctor=doctor,
+                doctor_id=doctor_id,
                 appointment_date=date,
                 status__in=['pending', 'confirmed']
             ).count()
 
-            # Calculate total possible slots
-            total_slots = 0
-            for schedule in schedules:
-                start = datetime.combine(date, schedule.start_time)
-                end = datetime.combine(date, schedule.end_time)
-                duration = timedelta(minutes=schedule.slot_duration)
-
-                current = start
-                while current + duration <= end:
-                    total_slots += 1
-                    current += duration
-
             return max(0, total_slots - booked_count)
 
         except Exception as e:
             print(f"Error counting slots: {e}")
             return 0
 
+    def _weekday_slot_totals(self, doctor_id):
+        """Total bookable slots per weekday for a doctor, cached until the schedule changes"""
+        return cache.get_or_set(
+            SLOT_TOTALS_CACHE_KEY.format(doctor_id=doctor_id),
+            lambda: self._build_weekday_slot_totals(doctor_id),
+            CONTEXT_CACHE_TIMEOUT
+        )
+
+    def _build_weekday_slot_totals(self, doctor_id):
+        totals = {}
+        for schedule in DoctorSchedule.objects.filter(doctor_id=doctor_id, is_active=True):
+            start = datetime.combine(date.min, schedule.start_time)
+            end = datetime.combine(date.min, schedule.end_time)
+            whole_slots = max(0, (end - start) // timedelta(minutes=schedule.slot_duration))
+            totals[schedule.day_of_week] = totals.get(schedule.day_of_week, 0) + whole_slots
+        return totals
+
     def get_available_slots_context(self, doctor_id, date):
         """Get detailed available slots for a specific date"""
         try:
-            doctor = Doctor.objects.get(id=doctor_id)
-            day_name = date.strftime('%A')
-
-            # Get day of week (0=Monday, 6=Sunday)
-            day_mapping = {
-                'Monday': 0, 'Tuesday': 1, 'Wednesday': 2, 'Thursday': 3,
-                'Friday': 4, 'Saturday': 5, 'Sunday': 6
-            }
-            day_of_week = day_mapping.get(day_name, -1)
-
             schedules = DoctorSchedule.objects.filter(
-                doctor=doctor,
-                day_of_week=day_of_week,
+                doctor_id=doctor_id,
+                day_of_week=date.weekday(),  # 0=Monday, 6=Sunday
                 is_active=True
             )
 
@@ -211,7 +266,7 @@ class RAGRetriever:
 
             # Check for leaves
             is_on_leave = DoctorLeave.objects.filter(
-                doctor=doctor,
+                doctor_id=doctor_id,
                 start_date__lte=date,
                 end_date__gte=date
             ).exists()
@@ -220,27 +275,24 @@ class RAGRetriever:
                 return {'available': False, 'reason': 'Doctor is on leave', 'slots': []}
 
             # Get booked times
-            booked_appointments = Appointment.objects.filter(
-                doctor=doctor,
+            booked_times = set(Appointment.objects.filter(
+                doctor_id=doctor_id,
                 appointment_date=date,
                 status__in=['pending', 'confirmed']
-            ).values_list('appointment_time', flat=True)
-
-            booked_times = [time.strftime('%I:%M %p') for time in booked_appointments]
+            ).values_list('appointment_time', flat=True))
 
             # Generate all slots
             all_slots = []
             for schedule in schedules:
-                current_time = datetime.combine(date, schedule.start_time)
-                end_time = datetime.combine(date, schedule.end_time)
-
-                while current_time < end_time:
-                    time_str = current_time.strftime('%I:%M %p')
-                    all_slots.append({
-                        'time': time_str,
-                        'available': time_str not in booked_times
-                    })
-                    current_time += timedelta(minutes=schedule.slot_duration)
+                start_time = datetime.combine(date, schedule.start_time)
+                duration = timedelta(minutes=schedule.slot_duration)
+                # Ceiling division: a trailing partial slot is still offered
+                slot_count = -(-(datetime.combine(date, schedule.end_time) - start_time) // duration)
+                slot_times = [(start_time + i * duration).time() for i in range(slot_count)]
+                all_slots.extend(
+                    {'time': format_time(slot_time), 'available': slot_time not in booked_times}
+                    for slot_time in slot_times
+                )
 
             available_count = sum(1 for slot in all_slots if slot['available'])
 
@@ -261,37 +313,38 @@ class RAGRetriever:
         """
         try:
             # Find specialization
-            specialization = Specialization.objects.filter(
-                Q(name__iexact=specialization_name) |
-                Q(name__icontains=specialization_name)
-            ).first()
+            specialization_id = self._find_specialization_id(specialization_name)
 
-            if not specialization:
+            if specialization_id is None:
                 return []
 
             # Get alternative doctors
             query = Doctor.objects.filter(
-                specialization=specialization,
+                specialization_id=specialization_id,
                 is_active=True
             ).order_by('consultation_fee')
 
             if current_doctor_id:
                 query = query.exclude(id=current_doctor_id)
 
-            alternative_doctors = query[:limit]
+            alternative_doctors = list(query.values('id', 'name', 'consultation_fee')[:limit])
 
             results = []
-            today = timezone.now().date()
+            today = timezone.localdate()
+            availability = self._available_slots_by_date(
+                [doctor['id'] for doctor in alternative_doctors], today, 30
+            )
 
             for doctor in alternative_doctors:
                 # Find next available date
-                next_available = self.find_next_available_date(doctor.id, today, max_days=30)
+                available_days = availability[doctor['id']]
 
-                if next_available:
+                if available_days:
+                    next_available = available_days[0][0]
                     results.append({
-                        'id': doctor.id,
-                        'name': doctor.name,
-                        'consultation_fee': float(doctor.consultation_fee) if doctor.consultation_fee else 0,
+                        'id': doctor['id'],
+                        'name': doctor['name'],
+                        'consultation_fee': float(doctor['consultation_fee']) if doctor['consultation_fee'] else 0,
                         'next_available_date': next_available.isoformat(),
                         'days_away': (next_available - today).days
                     })
@@ -302,17 +355,23 @@ class RAGRetriever:
             print(f"Error finding alternatives: {e}")
             return []
 
+    def _find_specialization_id(self, specialization_name):
+        """Exact (case-insensitive) name match first, then substring, against the cached specializations"""
+        name_lower = specialization_name.lower()
+        names = [(spec_id, spec_name.lower()) for spec_id, spec_name, _ in self._specialization_keywords()]
+
+        for spec_id, name in names:
+            if name == name_lower:
+                return spec_id
+        for spec_id, name in names:
+            if name_lower in name:
+                return spec_id
+        return None
+
     def find_next_available_date(self, doctor_id, start_date, max_days=30):
         """Find next available date for a doctor"""
-        current_date = start_date
-
-        for _ in range(max_days):
-            slots_count = self.get_available_slots_count(doctor_id, current_date)
-            if slots_count > 0:
-                return current_date
-            current_date += timedelta(days=1)
-
-        return None
+        available_days = self._available_slots_by_date([doctor_id], start_date, max_days)[doctor_id]
+        return available_days[0][0] if available_days else None
 
     def search_doctors_by_symptoms(self, symptoms_text):
         """
@@ -324,45 +383,61 @@ class RAGRetriever:
         # Search specializations by keywords
         matching_specializations = []
 
-        for spec in Specialization.objects.all():
-            keywords = spec.keywords.lower() if spec.keywords else ''
-            keyword_list = [k.strip() for k in keywords.split(',')]
-
+        for spec_id, spec_name, keyword_list in self._specialization_keywords():
             # Check if any keyword matches symptoms
-            matches = [kw for kw in keyword_list if kw and kw in symptoms_lower]
+            matches = [kw for kw in keyword_list if kw in symptoms_lower]
 
             if matches:
                 matching_specializations.append({
-                    'specialization': spec,
+                    'id': spec_id,
+                    'specialization': spec_name,
                     'match_count': len(matches),
                     'matched_keywords': matches
                 })
 
         # Sort by match count
         matching_specializations.sort(key=lambda x: x['match_count'], reverse=True)
+        top_matches = matching_specializations[:3]
+
+        # Cheapest two doctors per matched specialization, from a single query
+        doctors_by_spec = {match['id']: [] for match in top_matches}
+        doctors = Doctor.objects.filter(
+            specialization_id__in=doctors_by_spec,
+            is_active=True
+        ).order_by('consultation_fee').values('id', 'name', 'consultation_fee', 'specialization_id')
+
+        for doc in doctors:
+            spec_doctors = doctors_by_spec[doc['specialization_id']]
+            if len(spec_doctors) < 2:
+                spec_doctors.append({
+                    'id': doc['id'],
+                    'name': doc['name'],
+                    'fee': float(doc['consultation_fee']) if doc['consultation_fee'] else 0
+                })
 
-        results = []
-        for match in matching_specializations[:3]:
-            spec = match['specialization']
-            doctors = Doctor.objects.filter(
-                specialization=spec,
-                is_active=True
-            ).order_by('consultation_fee')[:2]
-
-            results.append({
-                'specialization': spec.name,
+        return [
+            {
+                'specialization': match['specialization'],
                 'matched_keywords': match['matched_keywords'],
-                'doctors': [
-                    {
-                        'id': doc.id,
-                        'name': doc.name,
-                        'fee': float(doc.consultation_fee) if doc.consultation_fee else 0
-                    }
-                    for doc in doctors
-                ]
-            })
-
-        return results
+                'doctors': doctors_by_spec[match['id']]
+            }
+            for match in top_matches
+        ]
+
+    def _specialization_keywords(self):
+        """(id, name, lowercased keywords) for every specialization, cached until one changes"""
+        return cache.get_or_set(
+            SPECIALIZATION_KEYWORDS_CACHE_KEY,
+            self._build_specialization_keywords,
+            CONTEXT_CACHE_TIMEOUT
+        )
+
+    def _build_specialization_keywords(self):
+        keywords = []
+        for spec in Specialization.objects.values('id', 'name', 'keywords'):
+            keyword_list = [k.strip() for k in spec['keywords'].lower().split(',')]
+            keywords.append((spec['id'], spec['name'], [kw for kw in keyword_list if kw]))
+        return keywords
 
     def extract_current_booking_state(self, session_data):
         """Extract current booking state for context"""
@@ -383,7 +458,9 @@ class RAGRetriever:
         try:
             appointments = Appointment.objects.filter(
                 patient_phone=phone_number
-            ).select_related('doctor', 'doctor__specialization').order_by('-appointment_date')[:5]
+            ).select_related('doctor__specialization').only(
+                'appointment_date', 'status', 'doctor__name', 'doctor__specialization__name'
+            ).order_by('-appointment_date')[:5]
 
             return [
                 {
@@ -398,3 +475,27 @@ class RAGRetriever:
         except Exception as e:
             print(f"Error getting patient history: {e}")
             return []
+
+
+# Singleton instance
+_rag_retriever = None
+_rag_retriever_lock = threading.Lock()
+
+
+def get_rag_retriever():
+    """
+    Get or create the shared RAGRetriever instance.
+
+    The retriever holds no per-session state, so every conversation
+    can use the same instance.
+
+    Returns:
+        RAGRetriever: The shared retriever instance
+    """
+    global _rag_retriever
+    if _rag_retriever is None:
+        with _rag_retriever_lock:
+            # Re-check: another thread may have created it while we waited
+            if _rag_retriever is None:
+                _rag_retriever = RAGRetriever()
+    return _rag_retriever
@@ -0,0 +1,116 @@
+"""
+Signal handlers for the voicebot app.
+Keep cached doctor, specialization, schedule and slot data in step with the database.
+"""
+
+from datetime import timedelta
+
+from django.core.cache import cache
+from django.db.models.signals import pre_save, post_save, post_delete
+from django.dispatch import receiver
+
+from doctors.models import Doctor, DoctorSchedule, DoctorLeave, Specialization
+from appointments.models import Appointment
+from .database_action_handler import (
+    SPECIALIZATIONS_CACHE_KEY, ACTIVE_DOCTOR_NAMES_CACHE_KEY, SCHEDULE_CACHE_KEY,
+    AVAILABLE_SLOTS_CACHE_KEY
+)
+from .rag_retriever import (
+    DOCTORS_CONTEXT_CACHE_KEY, SPECIALIZATIONS_CONTEXT_CACHE_KEY, SPECIALIZATION_KEYWORDS_CACHE_KEY,
+    DOCTOR_DETAILS_CACHE_KEY, SLOT_TOTALS_CACHE_KEY
+)
+
+# Fields each cache key is built from; their stored values are kept on pre_save so that
+# moving a row (another weekday, date or doctor) clears the old keys as well as the new ones
+CACHE_KEY_FIELDS = {
+    DoctorSchedule: ('doctor_id', 'day_of_week'),
+    Appointment: ('doctor_id', 'appointment_date'),
+    DoctorLeave: ('doctor_id', 'start_date', 'end_date'),
+}
+
+
+def _previous_values(instance):
+    """Stored cache-key fields captured before the save, or None for new rows and deletes."""
+    return instance.__dict__.pop('_previous_cache_key_values', None)
+
+
+def _available_slots_keys(doctor_id, dates):
+    return [AVAILABLE_SLOTS_CACHE_KEY.format(doctor_id=doctor_id, date=date.isoformat()) for date in dates]
+
+
+def _leave_dates(start_date, end_date):
+    return [start_date + timedelta(days=i) for i in range((end_date - start_date).days + 1)]
+
+
+@receiver([post_save, post_delete], sender=Doctor)
+@receiver([post_save, post_delete], sender=Specialization)
+def clear_reference_data_cache(sender, **kwargs):
+    """Drop cached doctor and specialization lists after any change."""
+    cache.delete_many([
+        SPECIALIZATIONS_CACHE_KEY, ACTIVE_DOCTOR_NAMES_CACHE_KEY,
+        DOCTORS_CONTEXT_CACHE_KEY, SPECIALIZATIONS_CONTEXT_CACHE_KEY, SPECIALIZATION_KEYWORDS_CACHE_KEY
+    ])
+
+
+@receiver([post_save, post_delete], sender=Doctor)
+def clear_doctor_details_cache(sender, instance, **kwargs):
+    """Drop the cached details for the changed doctor."""
+    cache.delete(DOCTOR_DETAILS_CACHE_KEY.format(doctor_id=instance.id))
+
+
+@receiver(post_save, sender=Specialization)
+def clear_specialization_doctor_details_cache(sender, instance, **kwargs):
+    """Drop cached details of doctors showing the changed specialization."""
+    cache.delete_many([
+        DOCTOR_DETAILS_CACHE_KEY.format(doctor_id=doctor_id)
+        for doctor_id in instance.doctors.values_list('id', flat=True)
+    ])
+
+
+@receiver(pre_save, sender=DoctorSchedule)
+@receiver(pre_save, sender=Appointment)
+@receiver(pre_save, sender=DoctorLeave)
+def remember_previous_cache_key_values(sender, instance, **kwargs):
+    """Load the stored values of the fields the cache keys are built from."""
+    instance._previous_cache_key_values = (
+        sender.objects.filter(pk=instance.pk).values(*CACHE_KEY_FIELDS[sender]).first()
+        if instance.pk else None
+    )
+
+
+@receiver([post_save, post_delete], sender=DoctorSchedule)
+def clear_schedule_cache(sender, instance, **kwargs):
+    """Drop the cached schedule and slot totals for the old and new doctor/weekday."""
+    keys = [
+        SCHEDULE_CACHE_KEY.format(doctor_id=instance.doctor_id, weekday=instance.day_of_week),
+        SLOT_TOTALS_CACHE_KEY.format(doctor_id=instance.doctor_id)
+    ]
+    previous = _previous_values(instance)
+    if previous:
+        keys += [
+            SCHEDULE_CACHE_KEY.format(doctor_id=previous['doctor_id'], weekday=previous['day_of_week']),
+            SLOT_TOTALS_CACHE_KEY.format(doctor_id=previous['doctor_id'])
+        ]
+    cache.delete_many(keys)
+
+
+@receiver([post_save, post_delete], sender=Appointment)
+def clear_available_slots_cache(sender, instance, **kwargs):
+    """Drop the cached available slots for the appointment's old and new doctor/date."""
+    keys = _available_slots_keys(instance.doctor_id, [instance.appointment_date])
+    previous = _previous_values(instance)
+    if previous:
+        keys += _available_slots_keys(previous['doctor_id'], [previous['appointment_date']])
+    cache.delete_many(keys)
+
+
+@receiver([post_save, post_delete], sender=DoctorLeave)
+def clear_leave_available_slots_cache(sender, instance, **kwargs):
+    """Drop the cached available slots for every date the old and new leave covers."""
+    keys = _available_slots_keys(instance.doctor_id, _leave_dates(instance.start_date, instance.end_date))
+    previous = _previous_values(instance)
+    if previous:
+        keys += _available_slots_keys(
+            previous['doctor_id'], _leave_dates(previous['start_date'], previous['end_date'])
+        )
+    cache.delete_many(keys)
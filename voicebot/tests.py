@@ -1,3 +1,178 @@
-from django.test import TestCase
+from datetime import date, time, timedelta
+
+from django.core.cache import cache
+from django.test import SimpleTestCase, TestCase
+from django.utils import timezone
+
+from appointments.models import Appointment
+from doctors.models import Doctor, DoctorSchedule, Specialization
+from voicebot.conversation_context_manager import ConversationContextManager
+from voicebot.database_action_handler import DatabaseActionHandler, _parse_date, _parse_time
+from voicebot.gemini_rag_service import _extract_json
+from voicebot.models import ConversationMessage
 
 # Create your VoiceBot tests here
+
+
+class ParseDateTests(SimpleTestCase):
+    def test_parses_iso_date(self):
+        self.assertEqual(_parse_date('2026-10-18'), date(2026, 10, 18))
+
+    def test_rejects_invalid_dates(self):
+        for value in ['18-10-2026', '2026-13-01', '2026-02-30', 'tomorrow', '']:
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                _parse_date(value)
+
+
+class ParseTimeTests(SimpleTestCase):
+    def test_parses_twelve_hour_times(self):
+        cases = {
+            '10:30 AM': time(10, 30),
+            '9:05 am': time(9, 5),
+            '12:00 AM': time(0, 0),
+            '12:15 PM': time(12, 15),
+            '04:45 PM': time(16, 45),
+            ' 11:00  pm ': time(23, 0),
+        }
+        for value, expected in cases.items():
+            with self.subTest(value=value):
+                self.assertEqual(_parse_time(value), expected)
+
+    def test_rejects_invalid_times(self):
+        for value in ['13:00 PM', '0:30 AM', '10:60 AM', '10:3 AM', '10:30', '14:30', 'ten AM', '']:
+            with self.subTest(value=value), self.assertRaises(ValueError):
+                _parse_time(value)
+
+
+class ExtractJsonTests(SimpleTestCase):
+    def test_fenced_block_wins_over_earlier_braces(self):
+        text = 'Using {context} here:\n```json\n{"action": "continue"}\n```'
+        self.assertEqual(_extract_json(text), '{"action": "continue"}')
+
+    def test_unterminated_fence(self):
+        self.assertEqual(_extract_json('```\n{"a": 1}'), '{"a": 1}')
+
+    def test_bare_object(self):
+        self.assertEqual(_extract_json('Sure! {"a": {"b": 1}} done'), '{"a": {"b": 1}}')
+
+    def test_no_json(self):
+        self.assertIsNone(_extract_json('Which doctor would you like?'))
+
+
+class DatabaseActionHandlerBookingTests(TestCase):
+    def setUp(self):
+        cache.clear()
+        self.handler = DatabaseActionHandler()
+        self.day = timezone.localdate() + timedelta(days=1)
+        specialization = Specialization.objects.create(name='General Physician', keywords='fever')
+        self.doctor = Doctor.objects.create(
+            name='Asha Rao', specialization=specialization, phone='9000000000', email='asha@example.com'
+        )
+        DoctorSchedule.objects.create(
+            doctor=self.doctor, day_of_week=self.day.weekday(),
+            start_time=time(9, 0), end_time=time(10, 0), slot_duration=30
+        )
+
+    def _create(self, slot='09:00 AM', phone='9876543210'):
+        with self.captureOnCommitCallbacks(execute=True):
+            return self.handler.create_appointment({
+                'patient_name': 'Ravi', 'phone': phone, 'doctor_id': self.doctor.id,
+                'date': self.day.isoformat(), 'time': slot,
+            })
+
+    def _available_slots(self):
+        result = self.handler.check_availability({'doctor_id': self.doctor.id, 'date': self.day.isoformat()})
+        return result['data']['available_slots']
+
+    def test_create_rejects_double_booking(self):
+        self.assertEqual(self._create()['status'], 'success')
+
+        result = self._create(phone='9123456780')
+
+        self.assertEqual(result['status'], 'error')
+        self.assertEqual(result['data'], {'reason': 'slot_occupied'})
+        self.assertEqual(Appointment.objects.filter(doctor=self.doctor).count(), 1)
+
+    def test_create_clears_cached_slots(self):
+        self.assertEqual(self._available_slots(), ['09:00 AM', '09:30 AM'])
+
+        self._create()
+
+        self.assertEqual(self._available_slots(), ['09:30 AM'])
+
+    def test_cancel_clears_cached_slots(self):
+        appointment_id = self._create()['data']['appointment_id']
+        self.assertEqual(self._available_slots(), ['09:30 AM'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result = self.handler.cancel_appointment({'appointment_id': appointment_id, 'phone': '9876543210'})
+
+        self.assertEqual(result['data']['original_time'], '09:00 AM')
+        self.assertEqual(self._available_slots(), ['09:00 AM', '09:30 AM'])
+
+    def test_reschedule_clears_cached_slots(self):
+        appointment_id = self._create()['data']['appointment_id']
+        self.assertEqual(self._available_slots(), ['09:30 AM'])
+
+        with self.captureOnCommitCallbacks(execute=True):
+            result = self.handler.reschedule_appointment({
+                'appointment_id': appointment_id, 'phone': '9876543210',
+                'new_date': self.day.isoformat(), 'new_time': '09:30 AM',
+            })
+
+        self.assertEqual(result['status'], 'success')
+        self.assertEqual(result['data']['old_time'], '09:00 AM')
+        self.assertEqual(self._available_slots(), ['09:00 AM'])
+
+    def test_reschedule_rejects_booked_slot(self):
+        appointment_id = self._create()['data']['appointment_id']
+        self._create(slot='09:30 AM', phone='9123456780')
+
+        result = self.handler.reschedule_appointment({
+            'appointment_id': appointment_id, 'phone': '9876543210',
+            'new_date': self.day.isoformat(), 'new_time': '09:30 AM',
+        })
+
+        self.assertEqual(result['status'], 'error')
+        self.assertEqual(Appointment.objects.get(id=appointment_id).appointment_time, time(9, 0))
+
+
+class ConversationHistoryTests(TestCase):
+    def setUp(self):
+        self.context = ConversationContextManager('history-session')
+        self.context.flush_messages()
+
+    def _contents(self, history):
+        return [msg['content'] for msg in history]
+
+    def test_history_includes_pending_messages_after_saved_ones(self):
+        self.context.add_message('user', 'I have a fever')
+        self.context.add_message('assistant', 'Let me find a doctor')
+
+        history = self.context.get_conversation_history()
+
+        self.assertEqual(
+            self._contents(history),
+            ['Conversation started', 'I have a fever', 'Let me find a doctor']
+        )
+        self.assertEqual(ConversationMessage.objects.filter(conversation=self.context.conversation).count(), 1)
+
+    def test_history_limit_keeps_newest_messages(self):
+        self.context.add_message('user', 'first')
+        self.context.flush_messages()
+        self.context.add_message('assistant', 'second')
+        self.context.add_message('user', 'third')
+
+        self.assertEqual(self._contents(self.context.get_conversation_history(limit=2)), ['second', 'third'])
+        self.assertEqual(self._contents(self.context.get_conversation_history(limit=3)), ['first', 'second', 'third'])
+
+    def test_flush_saves_pending_messages_in_order(self):
+        self.context.add_message('user', 'one')
+        self.context.add_message('assistant', 'two')
+
+        self.context.flush_messages()
+        self.context.flush_messages()
+
+        reloaded = ConversationContextManager('history-session')
+        self.assertEqual(self._contents(reloaded.get_conversation_history()), ['Conversation started', 'one', 'two'])
+        self.assertEqual(reloaded.conversation.message_count, 3)
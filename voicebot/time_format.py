@@ -0,0 +1,13 @@
+"""
+Time formatting helpers shared by the voicebot slot code
+"""
+from datetime import time
+
+# 12-hour clock (hour, AM/PM) for each 24-hour value, avoids strftime in loops
+_AMPM = [(hour % 12 or 12, 'AM' if hour < 12 else 'PM') for hour in range(24)]
+
+
+def format_time(value: time) -> str:
+    """Format a time as HH:MM AM/PM, same output as strftime('%I:%M %p')."""
+    hour, period = _AMPM[value.hour]
+    return f"{hour:02d}:{value.minute:02d} {period}"
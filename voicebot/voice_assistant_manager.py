@@ -9,6 +9,7 @@ following comprehensive personality and tone guidelines for natural, empathetic
 import json
 import re
 from datetime import datetime, timedelta
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from django.core.exceptions import ObjectDoesNotExist
 from difflib import SequenceMatcher
@@ -803,6 +804,14 @@ Example: "Perfect! I'll book you with Dr. {confirmed_doctor.name}. What date wor
                         'action': 'error'
                     }
 
+            except IntegrityError:
+                session_data['stage'] = 'time_selection'
+                return {
+                    'message': "I'm sorry, but that time slot was just booked by someone else. Which other time would work for you?",
+                    'stage': 'time_selection',
+                    'data': session_data,
+                    'action': 'slot_taken'
+                }
             except Exception as e:
                 print(f"Error creating appointment: {e}")
                 return {
@@ -1411,11 +1420,10 @@ Phone:"""
         """Get available time slots for doctor on specific date"""
         try:
             doctor = Doctor.objects.get(id=doctor_id)
-            weekday = date.strftime('%A')
 
             schedules = DoctorSchedule.objects.filter(
                 doctor=doctor,
-                day_of_week=weekday
+                day_of_week=date.weekday()
             )
 
             if not schedules.exists():
@@ -1602,15 +1610,16 @@ Phone:"""
             time_str = session_data['appointment_time']
             appointment_time = datetime.strptime(time_str, '%I:%M %p').time()
 
-            appointment = Appointment.objects.create(
-                doctor=doctor,
-                patient_name=session_data['patient_name'],
-                patient_phone=session_data['phone'],
-                appointment_date=appointment_date,
-                appointment_time=appointment_time,
-                status='confirmed',
-                booking_method='voice_assistant'
-            )
+            with transaction.atomic():
+                appointment = Appointment.objects.create(
+                    doctor=doctor,
+                    patient_name=session_data['patient_name'],
+                    patient_phone=session_data['phone'],
+                    appointment_date=appointment_date,
+                    appointment_time=appointment_time,
+                    status='confirmed',
+                    booking_method='voice_assistant'
+                )
 
             # Send SMS
             try:
@@ -1624,6 +1633,9 @@ Phone:"""
 
             return appointment
 
+        except IntegrityError:
+            # The unique slot constraint rejected a booking that raced us
+            raise
         except Exception as e:
             print(f"Error creating appointment: {e}")
             return None
@@ -7,10 +7,11 @@ with full context awareness and ability to handle changes at any stage.
 """
 
 from datetime import datetime, timedelta
+from django.db import IntegrityError, transaction
 from django.utils import timezone
 from voicebot.conversation_context_manager import ConversationContextManager
-from voicebot.rag_retriever import RAGRetriever
-from voicebot.gemini_rag_service import GeminiRAGService
+from voicebot.rag_retriever import get_rag_retriever
+from voicebot.gemini_rag_service import get_gemini_rag_service
 from doctors.models import Doctor
 from appointments.models import Appointment
 
@@ -24,8 +25,8 @@ class VoiceAssistantManagerRAG:
     def __init__(self, session_id):
         self.session_id = session_id
         self.context_manager = ConversationContextManager(session_id)
-        self.rag_retriever = RAGRetriever()
-        self.gemini_service = GeminiRAGService()
+        self.rag_retriever = get_rag_retriever()
+        self.gemini_service = get_gemini_rag_service()
 
     def process_voice_message(self, message):
         """
@@ -142,6 +143,10 @@ class VoiceAssistantManagerRAG:
                 'data': booking_state
             }
 
+        finally:
+            # Save this turn's messages in one batch
+            self.context_manager.flush_messages()
+
     def _update_booking_from_extracted_data(self, extracted_data, current_booking):
         """
         Update booking state from LLM-extracted data
@@ -378,6 +383,13 @@ class VoiceAssistantManagerRAG:
                 appointment_time = booking_state['appointment_time']
 
             # Check if slot is still available
+            slot_taken = {
+                'success': False,
+                'message': "I'm sorry, but that time slot was just booked by someone else. Let me show you other available times.",
+                'stage': 'time_selection',
+                'action': 'slot_taken',
+                'data': booking_state
+            }
             existing = Appointment.objects.filter(
                 doctor=doctor,
                 appointment_date=appointment_date,
@@ -386,25 +398,23 @@ class VoiceAssistantManagerRAG:
             ).exists()
 
             if existing:
-                return {
-                    'success': False,
-                    'message': "I'm sorry, but that time slot was just booked by someone else. Let me show you other available times.",
-                    'stage': 'time_selection',
-                    'action': 'slot_taken',
-                    'data': booking_state
-                }
+                return slot_taken
 
-            # Create appointment
-            appointment = Appointment.objects.create(
-                doctor=doctor,
-                patient_name=booking_state['patient_name'],
-                patient_phone=booking_state['patient_phone'],
-                appointment_date=appointment_date,
-                appointment_time=appointment_time,
-                status='confirmed',
-                symptoms='Booked via voice assistant',
-                session_id=self.session_id
-            )
+            # Create appointment, the unique slot constraint rejects a booking that raced us
+            try:
+                with transaction.atomic():
+                    appointment = Appointment.objects.create(
+                        doctor=doctor,
+                        patient_name=booking_state['patient_name'],
+                        patient_phone=booking_state['patient_phone'],
+                        appointment_date=appointment_date,
+                        appointment_time=appointment_time,
+                        status='confirmed',
+                        symptoms='Booked via voice assistant',
+                        session_id=self.session_id
+                    )
+            except IntegrityError:
+                return slot_taken
 
             # Mark conversation as completed
             self.context_manager.mark_completed(appointment_id=appointment.id)
@@ -499,3 +509,4 @@ You'll receive an SMS confirmation shortly. Please arrive 10 minutes early for y
     def reset_conversation(self):
         """Reset conversation (for testing)"""
         self.context_manager.reset_conversation()
+        self.context_manager.flush_messages()
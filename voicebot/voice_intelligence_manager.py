@@ -4,6 +4,7 @@ Orchestrates the voice intelligence assistant workflow using intent-to-action ar
 """
 
 import json
+import threading
 import uuid
 from typing import Dict, Any, Optional
 from django.core.cache import cache
@@ -409,3 +410,27 @@ class VoiceIntelligenceManager:
             "current_intent": context.get('current_intent'),
             "last_action": context.get('last_action')
         }
+
+
+# Singleton instance
+_voice_intelligence_manager = None
+_voice_intelligence_manager_lock = threading.Lock()
+
+
+def get_voice_intelligence_manager() -> VoiceIntelligenceManager:
+    """
+    Get or create the shared VoiceIntelligenceManager instance.
+
+    The manager keeps no per-request state (sessions live in the cache),
+    so one instance and its AI model client can serve every request.
+
+    Returns:
+        VoiceIntelligenceManager: The shared manager instance
+    """
+    global _voice_intelligence_manager
+    if _voice_intelligence_manager is None:
+        with _voice_intelligence_manager_lock:
+            # Re-check: another thread may have created it while we waited
+            if _voice_intelligence_manager is None:
+                _voice_intelligence_manager = VoiceIntelligenceManager(clinic_name="MedCare Clinic")
+    return _voice_intelligence_manager
@@ -9,7 +9,7 @@ from django.views import View
 from django.views.decorators.csrf import csrf_exempt
 from django.utils.decorators import method_decorator
 
-from .voice_intelligence_manager import VoiceIntelligenceManager
+from .voice_intelligence_manager import get_voice_intelligence_manager
 
 
 @method_decorator(csrf_exempt, name='dispatch')
@@ -23,7 +23,7 @@ class VoiceIntelligenceAPIView(View):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.manager = VoiceIntelligenceManager(clinic_name="MedCare Clinic")
+        self.manager = get_voice_intelligence_manager()
 
     def post(self, request):
         """
@@ -92,7 +92,7 @@ class DatabaseActionAPIView(View):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.manager = VoiceIntelligenceManager(clinic_name="MedCare Clinic")
+        self.manager = get_voice_intelligence_manager()
 
     def post(self, request):
         """
@@ -157,7 +157,7 @@ class IntentAnalysisAPIView(View):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.manager = VoiceIntelligenceManager(clinic_name="MedCare Clinic")
+        self.manager = get_voice_intelligence_manager()
 
     def post(self, request):
         """
@@ -211,7 +211,7 @@ class SessionManagementAPIView(View):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.manager = VoiceIntelligenceManager(clinic_name="MedCare Clinic")
+        self.manager = get_voice_intelligence_manager()
 
     def get(self, request):
         """
@@ -279,7 +279,7 @@ class VoicebotCompatibilityView(View):
 
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
-        self.manager = VoiceIntelligenceManager(clinic_name="MedCare Clinic")
+        self.manager = get_voice_intelligence_manager()
 
     def post(self, request):
         """
@@ -25,6 +25,11 @@ class WhatsAppService:
             'Content-Type': 'application/json'
         }
 
+        # Persistent session so sends reuse pooled keep-alive connections
+        # instead of a new TCP/TLS handshake per message
+        self.session = requests.Session()
+        self.session.headers.update(self.headers)
+
     def send_message(self, to_number: str, message: str) -> Optional[Dict]:
         """
         Send a WhatsApp message to a phone number using Meta WhatsApp Business API
@@ -61,9 +66,8 @@ class WhatsAppService:
             }
 
             # Send message via Meta WhatsApp API
-            response = requests.post(
+            response = self.session.post(
                 self.api_url,
-                headers=self.headers,
                 json=payload,
                 timeout=10
             )
@@ -157,9 +161,8 @@ class WhatsAppService:
                 }
             }
 
-            response = requests.post(
+            response = self.session.post(
                 self.api_url,
-                headers=self.headers,
                 json=payload,
                 timeout=10
             )
@@ -231,9 +234,8 @@ class WhatsAppService:
                     "text": header[:60]  # Max 60 chars
                 }
 
-            response = requests.post(
+            response = self.session.post(
                 self.api_url,
-                headers=self.headers,
                 json=payload,
                 timeout=10
             )